@@ -0,0 +1,101 @@
+"""Stress test of building bins from several threads at once.
+
+Builds a set of different bins one after another, then again from a pool
+of threads with empty caches, so that the threads race for the shared
+base cells, lip profiles and sketches, and checks that every part is
+identical to its serial build. Lazy bins are shared by all threads and
+the parts are tessellated concurrently as well.
+
+    python benchmarks/concurrency.py --threads 8 --rounds 3
+
+Exits with status 1 if any part differs.
+"""
+
+import argparse
+import hashlib
+import itertools
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import gridfinity as gf
+
+GRIDS = [
+    [[True]],
+    [[True] * 3] * 2,
+    [[True, True, True], [True, False, True], [True, True, True]],
+    [[True, False], [False, True]],
+    [[True, True, True], [True], [True, True]],
+]
+
+SPECS = [
+    dict(grid=grid, height=height, compartment=compartment, detail=detail)
+    for grid, height, compartment, detail in itertools.product(
+        GRIDS, (14, 21), ("default", None), ("print", "preview")
+    )
+]
+
+
+def fingerprint(part) -> tuple:
+    # the topology, the measures and the triangulation of the shape. The
+    # BREP itself depends on the order in which the cached shapes were
+    # first built, even in a single thread
+    mesh = gf.export.tessellate(part, tolerance=0.05)
+    return (
+        len(part.solids()),
+        len(part.faces()),
+        len(part.edges()),
+        len(part.vertices()),
+        round(part.volume, 6),
+        round(part.area, 6),
+        hashlib.sha256(mesh.vertices.tobytes()).hexdigest(),
+        hashlib.sha256(mesh.faces.tobytes()).hexdigest(),
+    )
+
+
+def build(spec: dict) -> tuple:
+    return fingerprint(gf.Bin(**spec))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'on' if gil else 'off'}")
+
+    gf.cache.clear()
+    start = time.perf_counter()
+    expected = [build(spec) for spec in SPECS]
+    print(f"serial: {len(SPECS)} bins in {time.perf_counter() - start:.1f}s")
+
+    failures = 0
+    for n in range(args.rounds):
+        gf.cache.clear()
+        lazy = [gf.Bin.spec(**spec) for spec in SPECS]
+        # every spec twice, once built directly and once from a lazy bin
+        # that another thread may be building at the same time
+        jobs = [(build, spec) for spec in SPECS] + [
+            (fingerprint, part) for part in lazy * 2
+        ]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.threads) as pool:
+            results = list(pool.map(lambda job: job[0](job[1]), jobs))
+        elapsed = time.perf_counter() - start
+        wrong = [
+            i
+            for i, result in enumerate(results)
+            if result != expected[i % len(SPECS)]
+        ]
+        failures += len(wrong)
+        print(
+            f"round {n + 1}: {len(jobs)} builds on {args.threads} threads "
+            f"in {elapsed:.1f}s, {len(wrong)} differ from the serial builds"
+        )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Benchmarks for the gridfinity components.
+
+Every case runs in a fresh process so that the shape caches are cold and
+the peak RSS belongs to the case alone. The first build of a case is
+reported as `cold`, the fastest of the repeated builds as `warm`.
+"""
+
+import argparse
+import functools
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+GRIDS = {
+    "1x1": [[True]],
+    "2x2": [[True] * 2] * 2,
+    "4x4": [[True] * 4] * 4,
+    "6x6": [[True] * 6] * 6,
+    "8x8": [[True] * 8] * 8,
+    "12x12": [[True] * 12] * 12,
+    "g": [
+        [True, True, True],
+        [True, False, True],
+        [True, True, True],
+        [False, False, True],
+        [True, True, True],
+    ],
+    "f": [
+        [True, True, True],
+        [True],
+        [True, True],
+        [True],
+        [True],
+    ],
+    "holes": [
+        [True] * 5,
+        [True, False, True, False, True],
+        [True] * 5,
+        [True, False, True, False, True],
+        [True] * 5,
+    ],
+}
+
+COMPARTMENTS = {
+    "div2x2": dict(div_x=2, div_y=2),
+    "div4x4-cutout": dict(
+        div_x=4, div_y=4, div_cutout_width=20, div_cutout_height=5
+    ),
+    "scoop-label": dict(div_x=1, div_y=2, with_label=True, scoops=["back"]),
+}
+
+
+# OCCT boolean options compared on large grids, the default runs the
+# booleans in parallel
+OPTIONS = {
+    "serial": dict(parallel=False),
+    "obb": dict(obb=True),
+}
+
+
+def _write(part: object, path: str, writer: str) -> None:
+    from build123d import Mesher, export_stl
+
+    import gridfinity as gf
+
+    if writer == "build123d.export_stl":
+        export_stl(part, path)
+    elif writer == "build123d.Mesher":
+        mesher = Mesher()
+        mesher.add_shape(part, linear_deflection=0.01)
+        mesher.write(path)
+    else:
+        getattr(gf.export, writer)(part, path, tolerance=0.01)
+
+
+# writers compared on a 6x6 bin, each run tessellates the bin again
+WRITERS = {
+    "build123d.export_stl": ".stl",
+    "build123d.Mesher": ".3mf",
+    "write_stl": ".stl",
+    "write_3mf": ".3mf",
+}
+
+
+@functools.cache
+def _export_bin() -> object:
+    import gridfinity as gf
+
+    return gf.Bin(GRIDS["6x6"], 21)
+
+
+def _export(writer: str) -> int:
+    import tempfile
+
+    from OCP.BRepTools import BRepTools
+
+    part = _export_bin()
+    BRepTools.Clean_s(part.wrapped)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "part" + WRITERS[writer])
+        _write(part, path, writer)
+        return os.path.getsize(path)
+
+
+def _with_options(options: dict, build: Callable[[], object]) -> object:
+    import gridfinity as gf
+
+    with gf.config.options(**options):
+        return build()
+
+
+def cases() -> dict[str, Callable[[], object]]:
+    from build123d import Cylinder
+
+    import gridfinity as gf
+
+    result: dict[str, Callable[[], object]] = {}
+    for name, grid in GRIDS.items():
+        result[f"Base[{name}]"] = lambda g=grid: gf.Base(g)
+        result[f"GridSketch[{name}]"] = lambda g=grid: gf.GridSketch(g, 0.25)
+        result[f"StackingLip[{name}]"] = lambda g=grid: gf.StackingLip(
+            g, with_support=True
+        )
+        result[f"Compartment[{name}]"] = lambda g=grid: gf.Compartment(g, 14)
+        result[f"Bin[{name}]"] = lambda g=grid: gf.Bin(g, 21)
+    for name in ("8x8", "12x12"):
+        grid = GRIDS[name]
+        for option, options in OPTIONS.items():
+            result[f"Bin[{name},{option}]"] = functools.partial(
+                _with_options, options, functools.partial(gf.Bin, grid, 21)
+            )
+    for name in ("4x4", "8x8", "12x12"):
+        result[f"TiledBin[{name}]"] = lambda g=GRIDS[name]: gf.TiledBin(g, 21)
+    result["TiledBin[20x20]"] = lambda: gf.TiledBin([[True] * 20] * 20, 21)
+    for name in ("1x1", "2x2", "4x4", "g"):
+        grid = GRIDS[name]
+        for option, kwargs in COMPARTMENTS.items():
+            result[f"SubdividedCompartment[{name}-{option}]"] = (
+                lambda g=grid, kw=kwargs: gf.extra.SubdividedCompartment(
+                    g, 14, **kw
+                )
+            )
+            result[f"Bin[{name}-{option}]"] = lambda g=grid, kw=kwargs: gf.Bin(
+                g, 21, compartment=gf.extra.SubdividedCompartment(g, 14, **kw)
+            )
+    for writer in WRITERS:
+        result[f"export[6x6,{writer}]"] = functools.partial(_export, writer)
+    result["booleans.cut[228 holes]"] = lambda: gf.booleans.cut(
+        gf.Bin([[True] * 3] * 2, 21, compartment=None),
+        [
+            (Cylinder(2, 10), (x, y, 21))
+            for x in range(-55, 56, 6)
+            for y in range(-35, 36, 6)
+        ],
+    )
+    return result
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return rss / 2**20 if sys.platform == "darwin" else rss / 2**10
+
+
+def measure(name: str, repeat: int) -> dict:
+    import gridfinity as gf
+
+    gf.cache.disable_disk()
+    build = cases()[name]
+    rss_before = _peak_rss_mb()
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - t0)
+    return {
+        "cold": times[0],
+        "warm": min(times[1:]) if repeat > 1 else None,
+        "peak_rss_mb": _peak_rss_mb(),
+        "import_rss_mb": rss_before,
+    }
+
+
+def run_case(name: str, repeat: int, timeout: float | None) -> dict:
+    cmd = [sys.executable, __file__, "--case", name, "--repeat", str(repeat)]
+    try:
+        proc = subprocess.run(
+            cmd, capture_output=True, text=True, timeout=timeout, check=False
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": "timeout"}
+    if proc.returncode != 0:
+        return {"error": proc.stderr.strip().splitlines()[-1]}
+    return json.loads(proc.stdout)
+
+
+def compare(
+    results: dict[str, dict], baseline: dict[str, dict], threshold: float
+) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or "error" in result or "error" in base:
+            continue
+        for key in ("cold", "peak_rss_mb"):
+            if result.get(key) and base.get(key):
+                ratio = result[key] / base[key]
+                if ratio > threshold:
+                    regressions.append(
+                        f"{name} {key}: {base[key]:.2f} -> "
+                        f"{result[key]:.2f} ({ratio:.2f}x)"
+                    )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k", dest="filter", default="", help="Only run cases containing this"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="Timeout per case in s"
+    )
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="Allowed ratio to the baseline (default 1.25)",
+    )
+    parser.add_argument("--list", action="store_true", help="List cases")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(measure(args.case, args.repeat)))
+        return 0
+
+    names = [n for n in cases() if args.filter in n]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    results = {}
+    print(f"{'case':<48} {'cold s':>8} {'warm s':>8} {'RSS MB':>8} {'+MB':>6}")
+    for name in names:
+        result = run_case(name, args.repeat, args.timeout)
+        results[name] = result
+        if "error" in result:
+            print(f"{name:<48} {result['error']}")
+            continue
+        warm = f"{result['warm']:8.3f}" if result["warm"] else " " * 8
+        rss = result["peak_rss_mb"] or 0
+        delta = rss - (result["import_rss_mb"] or 0)
+        print(
+            f"{name:<48} {result['cold']:8.3f} {warm} {rss:8.1f} {delta:6.1f}"
+        )
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(results, indent=2))
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(results, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
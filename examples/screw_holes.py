@@ -74,5 +74,16 @@ if __name__ == "__main__":
 
     export_stl(p.part, f"screw-holes_{args.grid[0]}x{args.grid[1]}.stl")
 
+    # the same holes with a single hole referenced at every location
+    locations = [
+        cell * hole
+        for cell in gf.utils.IrregularGridLocations(42, 42, grid).locations
+        for hole in GridLocations(26, 26, 2, 2).locations
+    ]
+    gf.export.write_3mf_instances(
+        [(ScrewHole(), locations)],
+        f"screw-holes_{args.grid[0]}x{args.grid[1]}.3mf",
+    )
+
     # from ocp_vscode import show
     # show(p)
@@ -1,13 +1,58 @@
-from . import extra, types, utils
-from .main import Base, Bin, Compartment, GridSketch, StackingLip
+import importlib
+import typing
+
+from . import (
+    booleans,
+    cache,
+    config,
+    estimate,
+    export,
+    extra,
+    mesh,
+    profiling,
+    tiled,
+    topology,
+    types,
+    utils,
+)
+from .main import Base, Bin, Compartment, GridSketch, LazyBin, StackingLip
+from .parametric import ParametricBin
+from .tiled import TiledBin
+from .types import Grid
+
+if typing.TYPE_CHECKING:
+    from . import aio, family
 
 __all__ = [
     "Bin",
+    "LazyBin",
+    "ParametricBin",
+    "TiledBin",
     "Base",
     "Compartment",
     "StackingLip",
     "GridSketch",
+    "Grid",
+    "aio",
+    "booleans",
+    "cache",
+    "config",
+    "estimate",
+    "export",
     "extra",
+    "family",
+    "mesh",
+    "profiling",
+    "tiled",
+    "topology",
     "types",
     "utils",
 ]
+
+
+def __getattr__(name: str) -> typing.Any:
+    # these import `batch`, which would be imported twice by
+    # `python -m gridfinity.batch` if they were imported here
+    if name in ("aio", "family"):
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
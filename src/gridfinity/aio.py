@@ -0,0 +1,126 @@
+"""Build parts from asyncio code without blocking the event loop.
+
+    part = await gf.aio.build_bin({"grid": "2x3", "height": 21})
+    parts = await gf.aio.build_many(specs, timeout=60)
+
+A spec holds the parameters of a part like a part of a
+`gridfinity.batch` spec file, its `type` defaults to `"Bin"`. The builds
+run on a process pool by default, since OCP holds the GIL while OCCT
+works and a build on a thread would still stall the event loop. A
+thread pool saves sending the parts between processes (`set_executor`).
+
+Concurrent requests for the same part are coalesced into a single build
+whose part all of them get, so it must not be modified. A request that
+is cancelled or times out stops waiting, the build itself is only
+cancelled once no request waits for it anymore. Builds that already run
+cannot be interrupted and finish in the background.
+"""
+
+import asyncio
+import threading
+from collections.abc import Iterable, Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any
+
+from build123d import Part
+
+from . import batch
+from .cache import deserialize, serialize
+
+_executor: Executor | None = None
+_lock = threading.Lock()
+# the running builds by event loop and spec digest
+_builds: dict[tuple[asyncio.AbstractEventLoop, str], "_Build"] = {}
+
+
+class _Build:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+def set_executor(executor: Executor | None) -> None:
+    """Run the builds on `executor`, `None` restores the process pool.
+
+    The executor is not shut down when it is replaced.
+    """
+    global _executor
+    with _lock:
+        _executor = executor
+
+
+def get_executor() -> Executor:
+    """The executor running the builds."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor()
+        return _executor
+
+
+async def build_bin(
+    spec: Mapping[str, Any],
+    timeout: float | None = None,
+    executor: Executor | None = None,
+) -> Part:
+    """Build the part of a spec on an executor.
+
+    Raises `TimeoutError` if the part is not built within `timeout`
+    seconds and the errors of the build itself.
+    """
+    spec = batch.normalize({"type": "Bin", **spec})
+    loop = asyncio.get_running_loop()
+    key = (loop, batch.digest(spec))
+    build = _builds.get(key)
+    if build is None:
+        task = loop.create_task(_run(spec, executor or get_executor()))
+        build = _builds[key] = _Build(task)
+        task.add_done_callback(lambda _: _forget(key, build))
+    build.waiters += 1
+    try:
+        return await asyncio.wait_for(asyncio.shield(build.task), timeout)
+    finally:
+        build.waiters -= 1
+        if not build.waiters and not build.task.done():
+            # nobody is waiting for it anymore
+            _forget(key, build)
+            build.task.cancel()
+
+
+async def build_many(
+    specs: Iterable[Mapping[str, Any]],
+    timeout: float | None = None,
+    executor: Executor | None = None,
+) -> list[Part]:
+    """Build the parts of many specs concurrently, in their order.
+
+    `timeout` applies to each part. If a build fails, the others are
+    cancelled and its error is raised.
+    """
+    tasks = [
+        asyncio.ensure_future(build_bin(spec, timeout, executor))
+        for spec in specs
+    ]
+    try:
+        return list(await asyncio.gather(*tasks))
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _run(spec: batch.Spec, executor: Executor) -> Part:
+    loop = asyncio.get_running_loop()
+    if not isinstance(executor, ProcessPoolExecutor):
+        return await loop.run_in_executor(executor, batch.build, spec)
+    data = await loop.run_in_executor(executor, _build_serialized, spec)
+    # reading a large part takes a while as well
+    return await loop.run_in_executor(None, deserialize, data)
+
+
+def _build_serialized(spec: batch.Spec) -> bytes:
+    return serialize(batch.build(spec))
+
+
+def _forget(key: tuple[asyncio.AbstractEventLoop, str], build: _Build) -> None:
+    if _builds.get(key) is build:
+        del _builds[key]
@@ -0,0 +1,303 @@
+"""Build a catalog of parts from a declarative spec file.
+
+The spec file (JSON or TOML) lists the parts in a `parts` array::
+
+    [[parts]]
+    type = "Bin"
+    grid = "2x3"
+    height = 21
+    compartment = { div_x = 2, div_y = 3, with_label = true }
+
+    [[parts]]
+    type = "SubdividedCompartment"
+    grid = [[true, true], [true]]
+    height = 14
+    div_x = 2
+    div_y = 1
+
+    [[parts]]
+    type = "Bin"
+    grid = "1x1"
+    matrix = { height = [14, 21, 28], grid = ["1x1", "2x1"] }
+
+`grid` is either `WxH` or nested lists. For a `Bin` the `compartment` is
+either `false`, omitted for the default compartment, or the arguments of
+an `extra.SubdividedCompartment` (its height defaults to the bin height
+minus 7 mm). Every combination of the values in `matrix` is added as a
+separate part and identical parts are only built once. The files of a
+part are named after its `name`, a name given to different parts gets
+their digest appended so that they do not overwrite each other.
+
+Usage::
+
+    python -m gridfinity.batch catalog.toml --out build --workers 8
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import sys
+import time
+from collections.abc import Iterable, Mapping
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+from build123d import Part, export_step, export_stl
+
+from .export import write_3mf
+from .extra import SubdividedCompartment
+from .main import Bin
+from .topology import validate
+from .types import Grid
+
+Spec = dict[str, Any]
+
+
+def parse_grid(value: str | Iterable[Iterable[bool]]) -> Grid:
+    """Parse a grid given as `WxH` or as nested lists.
+
+    Grids without any cells are rejected before anything is built.
+    """
+    if isinstance(value, str):
+        try:
+            w, h = map(int, value.lower().split("x"))
+        except ValueError as e:
+            raise ValueError(
+                f"Invalid grid: '{value}'. Expected format: WxH (e.g., 2x3)"
+            ) from e
+        grid = Grid([[True] * w] * h)
+    else:
+        grid = Grid(value)
+    validate(grid)
+    return grid
+
+
+def load(path: str | os.PathLike) -> list[Spec]:
+    """Read a spec file and expand it into a list of part specs."""
+    path = Path(path)
+    if path.suffix == ".toml":
+        import tomllib
+
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    else:
+        with open(path) as f:
+            data = json.load(f)
+    return expand(data["parts"])
+
+
+def expand(parts: Iterable[Mapping[str, Any]]) -> list[Spec]:
+    """Expand the `matrix` of each part spec and normalize all specs."""
+    specs = []
+    for part in parts:
+        part = dict(part)
+        matrix = part.pop("matrix", {})
+        keys = list(matrix)
+        for values in itertools.product(*(matrix[k] for k in keys)):
+            specs.append(
+                normalize({**part, **dict(zip(keys, values, strict=True))})
+            )
+    return specs
+
+
+def normalize(spec: Mapping[str, Any]) -> Spec:
+    """Bring a part spec into a canonical, JSON serializable form."""
+    spec = _numbers(dict(spec))
+    if spec.get("type") not in ("Bin", "SubdividedCompartment"):
+        raise ValueError(f"Unknown part type: {spec.get('type')!r}")
+    spec["grid"] = [list(row) for row in parse_grid(spec["grid"])]
+    if "scoops" in spec:
+        spec["scoops"] = sorted(set(spec["scoops"]))
+    compartment = spec.get("compartment")
+    if isinstance(compartment, Mapping):
+        compartment = dict(compartment)
+        if "scoops" in compartment:
+            compartment["scoops"] = sorted(set(compartment["scoops"]))
+        spec["compartment"] = compartment
+    return spec
+
+
+def digest(spec: Mapping[str, Any]) -> str:
+    """Identifier of a part spec, equal specs share the same digest."""
+    payload = json.dumps(
+        _numbers({k: v for k, v in spec.items() if k != "name"}),
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _numbers(value: Any) -> Any:
+    # whole numbers as int, so that `21` and `21.0` are the same spec
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, Mapping):
+        return {k: _numbers(v) for k, v in value.items()}
+    if isinstance(value, list | tuple):
+        return [_numbers(v) for v in value]
+    return value
+
+
+def default_name(spec: Mapping[str, Any]) -> str:
+    n_cols, n_rows = Grid(spec["grid"]).size
+    return (
+        f"{spec['type'].lower()}_{n_cols}x{n_rows}"
+        f"_h{spec['height']:g}_{digest(spec)[:8]}"
+    )
+
+
+def build(spec: Mapping[str, Any]) -> Part:
+    """Build the part described by a spec."""
+    args = {k: v for k, v in spec.items() if k not in ("type", "name")}
+    args["grid"] = parse_grid(args["grid"])
+    if spec["type"] == "SubdividedCompartment":
+        return SubdividedCompartment(**args)
+
+    compartment = args.pop("compartment", "default")
+    if compartment is False:
+        compartment = None
+    elif isinstance(compartment, Mapping):
+        compartment = SubdividedCompartment(
+            **{
+                "height": args["height"] - 7,
+                "detail": args.get("detail", "print"),
+                **compartment,
+                "grid": args["grid"],
+            }
+        )
+    stacking_lip = args.pop("stacking_lip", "default")
+    if stacking_lip is False:
+        stacking_lip = None
+    return Bin(compartment=compartment, stacking_lip=stacking_lip, **args)
+
+
+def _run(
+    spec: Spec, name: str, out: Path, formats: tuple[str, ...]
+) -> dict[str, Any]:
+    t0 = time.perf_counter()
+    part = build(spec)
+    t1 = time.perf_counter()
+    files = []
+    for fmt in formats:
+        path = out / f"{name}.{fmt}"
+        if fmt == "stl":
+            export_stl(part, path)
+        elif fmt == "3mf":
+            write_3mf(part, path)
+        else:
+            export_step(part, path)
+        files.append(path.name)
+    t2 = time.perf_counter()
+    return {
+        "name": name,
+        "spec": spec,
+        "files": files,
+        "build_seconds": t1 - t0,
+        "export_seconds": t2 - t1,
+        "pid": os.getpid(),
+    }
+
+
+def run(
+    specs: Iterable[Spec],
+    out: str | os.PathLike,
+    workers: int | None = None,
+    formats: Iterable[str] = ("stl",),
+) -> dict[str, Any]:
+    """Build and export all specs in parallel and write a manifest.
+
+    Returns the manifest, which is also written to `manifest.json` in the
+    output directory.
+    """
+    out = Path(out)
+    out.mkdir(parents=True, exist_ok=True)
+    formats = tuple(formats)
+
+    unique, duplicates = _plan(specs)
+
+    t0 = time.perf_counter()
+    parts, errors = [], []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_run, spec, name, out, formats): name
+            for spec, name in unique.values()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                errors.append({"name": name, "error": repr(e)})
+                print(f"failed {name}: {e!r}", file=sys.stderr)
+                continue
+            result["duplicates"] = duplicates.get(name, [])
+            parts.append(result)
+            print(f"built {name} in {result['build_seconds']:.2f} s")
+
+    manifest = {
+        "workers": workers or os.cpu_count(),
+        "total_seconds": time.perf_counter() - t0,
+        "parts": sorted(parts, key=lambda p: p["name"]),
+        "errors": errors,
+    }
+    with open(out / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def _plan(
+    specs: Iterable[Spec],
+) -> tuple[dict[str, tuple[Spec, str]], dict[str, list[str]]]:
+    # the distinct specs by digest with their names, and the names of the
+    # specs equal to each of them. A name given to different specs, e.g.
+    # to all parts of a matrix, gets the digest appended
+    specs = [(spec, digest(spec)) for spec in specs]
+    digests: dict[str, set[str]] = {}
+    for spec, key in specs:
+        if spec.get("name"):
+            digests.setdefault(spec["name"], set()).add(key)
+
+    unique: dict[str, tuple[Spec, str]] = {}
+    duplicates: dict[str, list[str]] = {}
+    for spec, key in specs:
+        name = spec.get("name") or default_name(spec)
+        if len(digests.get(name, ())) > 1:
+            name = f"{name}_{key[:8]}"
+        if key not in unique:
+            unique[key] = (spec, name)
+        elif name != unique[key][1]:
+            duplicates.setdefault(unique[key][1], []).append(name)
+    return unique, duplicates
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m gridfinity.batch", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("spec", help="Spec file (.json or .toml)")
+    parser.add_argument(
+        "--out", default="build", help="Output directory (default build)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default number of CPUs)",
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=["stl", "3mf", "step"],
+        default=["stl"],
+        help="Export formats (default stl)",
+    )
+    args = parser.parse_args(argv)
+
+    manifest = run(load(args.spec), args.out, args.workers, args.formats)
+    return 1 if manifest["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
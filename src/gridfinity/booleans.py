@@ -0,0 +1,91 @@
+"""Booleans with many tools at once.
+
+Removing tools one builder operation at a time runs a boolean for every
+tool. These functions place all tools and run a single OCCT boolean on
+all of them instead::
+
+    holes = [(Cylinder(3, 20), (x, 0, 21)) for x in range(-15, 16, 10)]
+    part = gf.booleans.cut(gf.Bin(grid=[[True]], height=21), holes)
+"""
+
+from collections.abc import Iterable
+
+from build123d import Location, Part, Shape, VectorLike
+from OCP.BOPAlgo import BOPAlgo_GlueEnum
+from OCP.BRepAlgoAPI import (
+    BRepAlgoAPI_BooleanOperation,
+    BRepAlgoAPI_Cut,
+    BRepAlgoAPI_Fuse,
+)
+from OCP.ShapeUpgrade import ShapeUpgrade_UnifySameDomain
+from OCP.TopTools import TopTools_ListOfShape
+
+from . import config
+
+Tool = Shape | tuple[Shape, Location | VectorLike]
+
+
+def cut(part: Shape, tools: Iterable[Tool], clean: bool = True) -> Part:
+    """Remove all `tools` from `part` with a single boolean.
+
+    A tool is a shape or a pair of a shape and the location to place it
+    at. Placed shapes share the geometry of the shape instead of copying
+    it, so the same tool can be placed many times at little cost.
+    """
+    return _run(BRepAlgoAPI_Cut(), part, tools, clean)
+
+
+def fuse(
+    part: Shape, tools: Iterable[Tool], clean: bool = True, glue: bool = False
+) -> Part:
+    """Add all `tools` to `part` with a single boolean.
+
+    With `glue` the shapes may only touch along shared faces but must not
+    overlap, OCCT then skips most of the intersection tests.
+    """
+    op = BRepAlgoAPI_Fuse()
+    if glue:
+        op.SetGlue(BOPAlgo_GlueEnum.BOPAlgo_GlueShift)
+    return _run(op, part, tools, clean)
+
+
+def _placed(tools: Iterable[Tool]) -> TopTools_ListOfShape:
+    result = TopTools_ListOfShape()
+    for tool in tools:
+        if isinstance(tool, Shape):
+            result.Append(tool.wrapped)
+            continue
+        shape, loc = tool
+        if not isinstance(loc, Location):
+            loc = Location(loc)
+        result.Append(shape.wrapped.Moved(loc.wrapped))
+    return result
+
+
+def _run(
+    op: BRepAlgoAPI_BooleanOperation,
+    part: Shape,
+    tools: Iterable[Tool],
+    clean: bool,
+) -> Part:
+    placed = _placed(tools)
+    if placed.Size() == 0:
+        return Part(part.wrapped)
+    args = TopTools_ListOfShape()
+    args.Append(part.wrapped)
+    op.SetArguments(args)
+    op.SetTools(placed)
+    # cached shapes are shared between threads, the boolean copies the
+    # parts of its arguments it changes (e.g. tolerances) instead
+    op.SetNonDestructive(True)
+    config.apply(op)
+    op.Build()
+    if not op.IsDone():
+        raise ValueError("Boolean operation failed")
+    shape = op.Shape()
+    if clean:
+        upgrader = ShapeUpgrade_UnifySameDomain(shape, True, True, True)
+        upgrader.AllowInternalEdges(False)
+        upgrader.Build()
+        shape = upgrader.Shape()
+    return Part(shape)
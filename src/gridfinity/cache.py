@@ -0,0 +1,283 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Mapping
+from concurrent.futures import Future
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import TypeVar
+
+from build123d import Compound, Part, Shape
+from build123d.persistence import serialize_shape
+from OCP.BRep import BRep_Builder
+from OCP.BRepTools import BRepTools
+from OCP.TopoDS import TopoDS_Shape
+
+from . import config
+from .profiling import stage
+from .types import Grid
+
+T = TypeVar("T")
+
+# the shapes in the order of their last use
+_shapes: OrderedDict[Hashable, object] = OrderedDict()
+_max_size: int | None = 1024
+# the shapes being built, threads asking for them wait for the result
+_pending: dict[Hashable, Future] = {}
+_lock = threading.Lock()
+
+
+def cached(key: Hashable, build: Callable[[], T]) -> T:
+    """Return the shape stored for `key`, calling `build` on first use.
+
+    Cached shapes are shared by all callers and must not be modified.
+    Threads asking for a shape while it is built wait for it instead of
+    building it again. The least recently used shapes are dropped once
+    the cache holds more than `set_max_size` shapes.
+    """
+    with _lock:
+        if key in _shapes:
+            _shapes.move_to_end(key)
+            return _shapes[key]  # type: ignore[return-value]
+        future = _pending.get(key)
+        owner = future is None
+        if owner:
+            future = _pending[key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        with config.scope():
+            shape = build()
+    except BaseException as e:
+        with _lock:
+            del _pending[key]
+        future.set_exception(e)
+        raise
+    with _lock:
+        shape = _shapes.setdefault(key, shape)  # type: ignore[assignment]
+        del _pending[key]
+        _evict()
+    future.set_result(shape)
+    return shape
+
+
+def clear() -> None:
+    """Remove all shapes from the cache."""
+    with _lock:
+        _shapes.clear()
+
+
+def size() -> int:
+    """Number of shapes in the cache."""
+    with _lock:
+        return len(_shapes)
+
+
+def set_max_size(max_size: int | None) -> None:
+    """Keep at most `max_size` shapes in the cache, `None` for no limit."""
+    global _max_size
+    if max_size is not None and max_size < 0:
+        raise ValueError("The size of the cache must not be negative")
+    with _lock:
+        _max_size = max_size
+        _evict()
+
+
+def max_size() -> int | None:
+    """Number of shapes the cache keeps at most."""
+    return _max_size
+
+
+def _evict() -> None:
+    # called with the lock held
+    if _max_size is None:
+        return
+    while len(_shapes) > _max_size:
+        _shapes.popitem(last=False)
+
+
+class _DiskCache:
+    def __init__(self, directory: Path, max_bytes: int | None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def entries(self) -> list[os.DirEntry]:
+        with os.scandir(self.directory) as it:
+            return [e for e in it if e.name.endswith(".brep")]
+
+    def load(self, key: str) -> Part | None:
+        path = self.directory / f"{key}.brep"
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            return None
+        try:
+            return deserialize(data)
+        except Exception:
+            # unreadable entries are rebuilt and replaced
+            return None
+
+    def save(self, key: str, part: Part) -> None:
+        data = serialize(part)
+        # write to a temporary file first, the rename is atomic so other
+        # processes never see partially written entries
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.directory / f"{key}.brep")
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self.evict()
+
+    def evict(self) -> None:
+        if self.max_bytes is None:
+            return
+        entries = []
+        for e in self.entries():
+            try:
+                stat = e.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, e.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            Path(path).unlink(missing_ok=True)
+            total -= size
+
+
+_disk: _DiskCache | None = None
+
+
+def serialize(part: Shape) -> bytes:
+    """Write a part to bytes, e.g. to pass it to another process."""
+    # the text format, OCCT sometimes rejects binary shapes read from
+    # Python streams
+    stream = io.BytesIO()
+    BRepTools.Write_s(part.wrapped, stream)
+    return stream.getvalue()
+
+
+def deserialize(data: bytes) -> Part:
+    """Read a part written by `serialize`."""
+    shape = TopoDS_Shape()
+    BRepTools.Read_s(shape, io.BytesIO(data), BRep_Builder())
+    return Part(Compound(shape).solids())
+
+
+def enable_disk(
+    directory: str | os.PathLike | None = None,
+    max_bytes: int | None = 2**30,
+) -> None:
+    """Persist generated parts as BREP files.
+
+    Entries are keyed on the component, its parameters and the versions of
+    this package and build123d. The least recently used entries are
+    removed once the directory grows beyond `max_bytes`. Without a
+    directory `GRIDFINITY_CACHE_DIR` or `~/.cache/gridfinity` is used.
+    """
+    global _disk
+    if directory is None:
+        directory = os.environ.get(
+            "GRIDFINITY_CACHE_DIR", Path.home() / ".cache" / "gridfinity"
+        )
+    _disk = _DiskCache(Path(directory).expanduser(), max_bytes)
+
+
+def disable_disk() -> None:
+    """Stop persisting generated parts, stored files are kept."""
+    global _disk
+    _disk = None
+
+
+def clear_disk() -> None:
+    """Remove all stored parts."""
+    if _disk is not None:
+        for e in _disk.entries():
+            Path(e.path).unlink(missing_ok=True)
+
+
+def disk_usage() -> int:
+    """Size of all stored parts in bytes."""
+    if _disk is None:
+        return 0
+    total = 0
+    for e in _disk.entries():
+        try:
+            total += e.stat().st_size
+        except FileNotFoundError:
+            pass
+    return total
+
+
+def stored(
+    component: str, params: Mapping[str, object], build: Callable[[], Part]
+) -> Part:
+    """Return the part built by `build`, using the disk cache if enabled.
+
+    The booleans of `build` use the options of `config`.
+    """
+    with stage(component) as s, config.scope():
+        disk = _disk
+        if disk is None:
+            part = build()
+            s.result(part)
+            return part
+        key = _digest(component, params)
+        part = disk.load(key)
+        hit = part is not None
+        if part is None:
+            part = build()
+            disk.save(key, part)
+        s.result(part, disk_cache_hit=hit)
+        return part
+
+
+def _digest(component: str, params: Mapping[str, object]) -> str:
+    try:
+        package_version = version("gridfinity")
+    except PackageNotFoundError:
+        package_version = "unknown"
+    items: list[object] = [
+        component,
+        package_version,
+        version("build123d"),
+        {k: _canonical(v) for k, v in params.items()},
+    ]
+    fuzzy = config.get().fuzzy
+    if fuzzy:
+        # a fuzzy tolerance may change the results of booleans
+        items.append({"fuzzy": repr(float(fuzzy))})
+    payload = json.dumps(items, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _canonical(value: object) -> object:
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    if isinstance(value, Grid):
+        return ["grid", list(value.masks)]
+    if isinstance(value, Shape):
+        data = serialize_shape(value.wrapped) or b""
+        return ["shape", hashlib.sha256(data).hexdigest()]
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(v) for v in value]
+        if isinstance(value, (set, frozenset)):
+            items.sort(key=repr)
+        return items
+    raise TypeError(f"Cannot derive a cache key from {value!r}")
+
+
+if "GRIDFINITY_CACHE_DIR" in os.environ:
+    enable_disk()
@@ -0,0 +1,161 @@
+"""Options of the OCCT booleans run while building parts.
+
+    gf.config.configure(fuzzy=1e-5)
+
+    with gf.config.options(parallel=False):
+        gf.Bin(grid=[[True] * 8] * 8, height=21)
+
+`parallel` runs the booleans on all cores, `fuzzy` is the distance up to
+which shapes are treated as touching and `obb` filters the candidates of
+intersections by oriented instead of axis aligned bounding boxes. The
+options apply to the booleans run by the components of this package,
+including those run through build123d while they build, but not to the
+booleans of other code.
+"""
+
+import dataclasses
+import threading
+import warnings
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from build123d import Shape
+from OCP.BRepAlgoAPI import BRepAlgoAPI_BuilderAlgo
+
+
+@dataclasses.dataclass(frozen=True)
+class Options:
+    parallel: bool = True
+    fuzzy: float = 0.0
+    obb: bool = False
+
+
+DEFAULT = Options()
+
+_default = DEFAULT
+_options: ContextVar[Options | None] = ContextVar(
+    "gridfinity.config.options", default=None
+)
+# whether the booleans are run by a component of this package
+_scoped: ContextVar[bool] = ContextVar(
+    "gridfinity.config.scoped", default=False
+)
+_original: Any = None
+_active = 0
+_lock = threading.Lock()
+
+
+def get() -> Options:
+    """The options in effect."""
+    options = _options.get()
+    return _default if options is None else options
+
+
+def configure(**changes: Any) -> None:
+    """Change the options for all threads outside of `options` contexts."""
+    global _default
+    _default = dataclasses.replace(_default, **changes)
+
+
+def reset() -> None:
+    """Restore the default options."""
+    global _default
+    _default = DEFAULT
+
+
+@contextmanager
+def options(**changes: Any) -> Iterator[Options]:
+    """Change the options within the context."""
+    token = _options.set(dataclasses.replace(get(), **changes))
+    try:
+        yield get()
+    finally:
+        _options.reset(token)
+
+
+def apply(op: BRepAlgoAPI_BuilderAlgo) -> None:
+    """Set the options in effect on an OCCT boolean operation."""
+    options = get()
+    op.SetRunParallel(options.parallel)
+    op.SetFuzzyValue(options.fuzzy)
+    op.SetUseOBB(options.obb)
+
+
+class _Operation:
+    # build123d always enables parallel mode, the proxy keeps the options
+    def __init__(self, op: BRepAlgoAPI_BuilderAlgo):
+        self._op = op
+        apply(op)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._op, name)
+
+    def SetRunParallel(self, flag: bool) -> None:
+        pass
+
+
+def _bool_op(self, args, tools, operation):
+    if _scoped.get():
+        operation.SetNonDestructive(True)
+        if get() != DEFAULT:
+            operation = _Operation(operation)
+    return _original(self, args, tools, operation)
+
+
+@contextmanager
+def scope() -> Iterator[None]:
+    """Apply the options to the build123d booleans run within the context.
+
+    Used by the components while they build. The booleans also run in
+    non-destructive mode like those of `booleans`, as their arguments may
+    be cached shapes shared with other threads. build123d offers no way to
+    set the options of its booleans, so `Shape._bool_op` is wrapped while
+    any scope is active. Booleans of other threads and tasks outside of a
+    scope run unchanged.
+    """
+    _install()
+    token = _scoped.set(True)
+    try:
+        yield
+    finally:
+        _scoped.reset(token)
+        _uninstall()
+
+
+def _install() -> None:
+    global _active, _original
+    with _lock:
+        _active += 1
+        current = Shape.__dict__.get("_bool_op")
+        if current is None:
+            if _active == 1:
+                warnings.warn(
+                    "build123d.Shape has no _bool_op, the booleans run "
+                    "through build123d ignore gridfinity.config",
+                    stacklevel=4,
+                )
+            return
+        if not _wraps(current):
+            _original = current
+            Shape._bool_op = _bool_op  # type: ignore[method-assign]
+
+
+def _uninstall() -> None:
+    global _active
+    with _lock:
+        _active -= 1
+        # left in place if it was wrapped again meanwhile (e.g. by a
+        # `Profiler`), it only changes booleans within a scope
+        if not _active and Shape.__dict__.get("_bool_op") is _bool_op:
+            Shape._bool_op = _original  # type: ignore[method-assign]
+
+
+def _wraps(func: Any) -> bool:
+    # whether `func` is `_bool_op` or a wrapper of it
+    while func is not None:
+        if func is _bool_op:
+            return True
+        func = getattr(func, "__wrapped__", None)
+    return False
@@ -0,0 +1,258 @@
+"""Dimensions, volume and mass of bins computed without building them.
+
+    props = gf.estimate.bin_properties(grid=[[True] * 3] * 2, height=21)
+    print(props.size, props.inner_volume, props.mass)
+
+The values are integrated from the outlines of the grid and the profiles
+of the base, the stacking lip and the compartment, no shapes are built.
+They match `Bin` with the default compartment and stacking lip exactly
+on rectangular grids. At concave corners of irregular grids the lip and
+the compartment are approximated to 0.05%.
+"""
+
+import dataclasses
+import functools
+import math
+import typing
+
+from .main import _BASE_PROFILE, _LIP_PROFILE, _LIP_ROUND, _LIP_SUPPORT
+from .outline import Point, corners, regions
+from .types import Detail, Grid, GridLike, check_detail
+
+# the constants of `Bin`, `GridSketch` and `Compartment`
+_SPACING = 42
+_INSET = 0.25
+_RADIUS = 4  # corner radius of the cells
+_COMPARTMENT_FILLET = 1
+_COMPARTMENT_FLOOR = 7
+
+# the round lowers the top of the lip
+_LIP_TOP = sum(_LIP_PROFILE) - _LIP_ROUND * (1 / math.tan(math.pi / 8) - 1)
+
+PLA_DENSITY = 1.24  # g/cm³
+
+
+@dataclasses.dataclass(frozen=True)
+class Properties:
+    size: tuple[float, float, float]  # outer dimensions in mm
+    volume: float  # material in mm³
+    inner_volume: float  # compartment in mm³
+    mass: float  # g
+
+
+def bin_properties(
+    grid: GridLike,
+    height: float,
+    compartment: bool = True,
+    stacking_lip: bool = True,
+    wall_thickness: float = 1.0,
+    detail: Detail = "print",
+    density: float = PLA_DENSITY,
+) -> Properties:
+    """Estimate the properties of a bin with the default components.
+
+    `wall_thickness` is the one of the compartment, the mass is the one
+    of a solid print of `density` in g/cm³.
+    """
+    grid = Grid(grid)
+    check_detail(detail)
+    if not grid.indices:
+        raise ValueError("Grid does not contain any cells")
+    rounded = detail == "print"
+    base_height = sum(_BASE_PROFILE)
+
+    outer = _sketch(grid, _INSET, rounded)
+    if rounded:
+        volume = grid.count * _base_cell()
+    else:
+        volume = outer.area * base_height
+    volume += outer.area * (height - base_height)
+    if stacking_lip:
+        # only the lip above the body adds to the bin
+        volume += _lip(grid, rounded, 0, math.inf, 0, math.inf)
+
+    inner_volume = 0.0
+    if compartment:
+        depth = height - _COMPARTMENT_FLOOR
+        inset = _INSET + wall_thickness
+        inner = _sketch(grid, inset, rounded)
+        inner_volume = inner.area * depth
+        if rounded:
+            # the bottom edges are rounded
+            r = _COMPARTMENT_FILLET
+            area = (1 - math.pi / 4) * r**2
+            x = (10 - 3 * math.pi) / (12 - 3 * math.pi) * r
+            inner_volume -= inner.sweep(area, x)
+        if stacking_lip:
+            # the compartment spares the support of the lip
+            inner_volume -= _lip(
+                grid, rounded, wall_thickness, math.inf, -depth, 0
+            )
+        volume -= inner_volume
+
+    (x0, y0, z0), (x1, y1, z1) = bin_bounds(grid, height, stacking_lip)
+    return Properties(
+        size=(x1 - x0, y1 - y0, z1 - z0),
+        volume=volume,
+        inner_volume=inner_volume,
+        mass=volume * density / 1000,
+    )
+
+
+def bin_bounds(
+    grid: GridLike, height: float, stacking_lip: bool = True
+) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
+    """The lowest and the highest corner of the bounding box of a bin."""
+    grid = Grid(grid)
+    if not grid.indices:
+        raise ValueError("Grid does not contain any cells")
+    (x0, y0), (x1, y1) = _sketch(grid, _INSET, False).bounds
+    top = height + _LIP_TOP if stacking_lip else height
+    return (x0, y0, 0), (x1, y1, top)
+
+
+class _Sketch(typing.NamedTuple):
+    area: float
+    straight: float  # length of the straight edges
+    convex: int
+    concave: int
+    radius: float
+    bounds: tuple[Point, Point]
+
+    def sweep(self, area: float, x: float) -> float:
+        """Volume of a section swept along the outlines.
+
+        The section has its centroid `x` away from the outlines towards
+        the cells (Pappus's theorem on the rounded corners).
+        """
+        corners = (self.convex + self.concave) * self.radius - x * (
+            self.convex - self.concave
+        )
+        return area * (self.straight + math.pi / 2 * corners)
+
+
+@functools.lru_cache(maxsize=1024)
+def _sketch(grid: Grid, inset: float, rounded: bool) -> _Sketch:
+    # the outlines of a `GridSketch`
+    radius = _RADIUS - inset if rounded else 0
+    area = straight = 0.0
+    convex = concave = 0
+    points: list[Point] = []
+    for outline, holes in regions(grid):
+        for loop in [outline, *holes]:
+            cs = corners(grid, loop, inset)
+            for k, (p, _, _, is_convex) in enumerate(cs):
+                q = cs[k - 1][0]
+                area += (q[0] * p[1] - q[1] * p[0]) / 2
+                straight += math.dist(p, q) - 2 * radius
+                if is_convex:
+                    convex += 1
+                else:
+                    concave += 1
+                points.append(p)
+    # rounding removes material at convex and adds it at concave corners
+    area -= (convex - concave) * (1 - math.pi / 4) * radius**2
+    bounds = (
+        (min(x for x, _ in points), min(y for _, y in points)),
+        (max(x for x, _ in points), max(y for _, y in points)),
+    )
+    return _Sketch(area, straight, convex, concave, radius, bounds)
+
+
+@functools.cache
+def _base_cell() -> float:
+    # the profile of a cell is tapered by 45° at its top and bottom
+    d0, d1, d2 = _BASE_PROFILE
+    size, radius = _SPACING - 2 * _INSET, _RADIUS - _INSET
+
+    def area(t: float) -> float:
+        return (size - 2 * t) ** 2 - (4 - math.pi) * (radius - t) ** 2
+
+    def tapered(t0: float, t1: float) -> float:
+        # the integral of the area over the inset
+        s, r = size, radius
+        return ((s - 2 * t0) ** 3 - (s - 2 * t1) ** 3) / 6 - (4 - math.pi) * (
+            (r - t0) ** 3 - (r - t1) ** 3
+        ) / 3
+
+    return tapered(0, d0) + area(d0) * d1 + tapered(d0, d0 + d2)
+
+
+def _lip(
+    grid: Grid, rounded: bool, x0: float, x1: float, z0: float, z1: float
+) -> float:
+    # the volume of the lip within x0 <= x <= x1 and z0 <= z <= z1
+    area, x, x0, x1 = _lip_part(rounded, x0, x1, z0, z1)
+    if area == 0:
+        return 0.0
+    if rounded:
+        return _sketch(grid, _INSET, True).sweep(area, x)
+    # the preview lip is a straight wall between two sketches
+    outer = _sketch(grid, _INSET + x0, False)
+    inner = _sketch(grid, _INSET + x1, False)
+    return area / (x1 - x0) * (outer.area - inner.area)
+
+
+@functools.lru_cache(maxsize=1024)
+def _lip_part(
+    rounded: bool, x0: float, x1: float, z0: float, z1: float
+) -> tuple[float, float, float, float]:
+    # the area, the x of the centroid and the extent in x of a part of
+    # the lip section
+    planes = [(1, 0, x0), (-1, 0, -x1), (0, 1, z0), (0, -1, -z1)]
+    section = _clip(_lip_section(rounded), *planes)
+    if len(section) < 3:
+        return 0.0, 0.0, 0.0, 0.0
+    area, x = _centroid(section)
+    return area, x, min(p[0] for p in section), max(p[0] for p in section)
+
+
+@functools.cache
+def _lip_section(rounded: bool) -> list[Point]:
+    # the cross-section of `StackingLip` with its support, x points
+    # towards the cells
+    d0, d1, d2 = _LIP_PROFILE
+    d3, d4 = _LIP_SUPPORT, d0 + d2
+    top = d0 + d1 + d2
+    if not rounded:
+        return [(0, -d3 - d4), (d4, -d3 - d4), (d4, _LIP_TOP), (0, _LIP_TOP)]
+    # the round of the top corner of 45°
+    r = _LIP_ROUND
+    cy = _LIP_TOP - r
+    arc = [
+        (r + r * math.cos(a), cy + r * math.sin(a))
+        for a in (math.pi - k * math.pi / 128 for k in range(97))
+    ]
+    return [*arc, (d0, top - d0), (d0, d2), (d4, 0), (d4, -d3), (0, -d3 - d4)]
+
+
+def _clip(
+    polygon: list[Point], *planes: tuple[float, float, float]
+) -> list[Point]:
+    # keeps the points with a * x + b * z >= c for each plane (a, b, c)
+    for a, b, c in planes:
+        result: list[Point] = []
+        for k, p in enumerate(polygon):
+            q = polygon[k - 1]
+            dp = a * p[0] + b * p[1] - c
+            dq = a * q[0] + b * q[1] - c
+            if (dp >= 0) != (dq >= 0):
+                t = dq / (dq - dp)
+                result.append(
+                    (q[0] + t * (p[0] - q[0]), q[1] + t * (p[1] - q[1]))
+                )
+            if dp >= 0:
+                result.append(p)
+        polygon = result
+    return polygon
+
+
+def _centroid(polygon: list[Point]) -> tuple[float, float]:
+    # the area and the x of the centroid
+    area = cx = 0.0
+    for k, (x1, y1) in enumerate(polygon):
+        x0, y0 = polygon[k - 1]
+        cross = x0 * y1 - x1 * y0
+        area += cross / 2
+        cx += (x0 + x1) * cross / 6
+    return abs(area), cx / area
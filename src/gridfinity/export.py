@@ -0,0 +1,322 @@
+"""Binary STL and 3MF files written from NumPy arrays.
+
+    gf.export.write_stl(part, "bin.stl")
+    gf.export.write_3mf(part, "bin.3mf", tolerance=0.01)
+
+Parts are tessellated once by OCCT and the triangulations of their
+faces are read into arrays in which the equal points of neighboring
+faces are welded into one vertex. STL files of parts are written by
+OCCT directly, meshes of `mesh.bin_mesh` are written without OCCT. The
+files are written with a few large writes instead of one call per
+triangle.
+
+Parts repeated at several locations, like the cells of a base, are
+written once and referenced by each placement, as components in 3MF
+and as instances of an assembly in STEP:
+
+    gf.export.write_3mf_instances(gf.export.bin_instances(grid, 21), path)
+"""
+
+import os
+import struct
+import typing
+import zipfile
+from collections.abc import Sequence
+from typing import IO
+
+import numpy as np
+from build123d import Compound, Location, Part, Shape, export_step
+from OCP.BRep import BRep_Tool
+from OCP.BRepBuilderAPI import BRepBuilderAPI_Copy
+from OCP.BRepMesh import BRepMesh_IncrementalMesh
+from OCP.StlAPI import StlAPI_Writer
+from OCP.TopAbs import TopAbs_FACE, TopAbs_REVERSED
+from OCP.TopExp import TopExp_Explorer
+from OCP.TopLoc import TopLoc_Location
+from OCP.TopoDS import TopoDS, TopoDS_Shape
+
+from .cache import cached, stored
+from .main import (
+    _BASE_PROFILE,
+    _base_cell,
+    _bin,
+    _bin_compartment,
+    _bin_cut,
+    _bin_lip,
+    _bin_shell,
+    _bin_wall,
+)
+from .mesh import Mesh, _weld
+from .types import Detail, Grid, GridLike, check_detail
+from .utils import IrregularGridLocations
+
+# a part and the locations it is placed at
+Instances = tuple[Shape | Mesh, Sequence[Location]]
+
+# a triangle of a binary STL file
+_STL = np.dtype(
+    [("normal", "<f4", 3), ("points", "<f4", (3, 3)), ("attribute", "<u2")]
+)
+
+_CONTENT_TYPES = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" \
+ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="model" \
+ContentType="application/vnd.ms-package.3dmanufacturing-3dmodel+xml"/>
+</Types>
+"""
+
+_RELS = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<Relationships \
+xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Target="/3D/3dmodel.model" Id="rel0" \
+Type="http://schemas.microsoft.com/3dmanufacturing/2013/01/3dmodel"/>
+</Relationships>
+"""
+
+_MODEL = """\
+<?xml version="1.0" encoding="UTF-8"?>
+<model unit="millimeter" xml:lang="en-US" \
+xmlns="http://schemas.microsoft.com/3dmanufacturing/core/2015/02">
+<resources>
+"""
+
+_CHUNK = 1 << 16  # rows formatted at once
+
+
+def tessellate(
+    shape: Shape, tolerance: float = 1e-3, angular_tolerance: float = 0.1
+) -> Mesh:
+    """Triangulate a shape into a welded mesh.
+
+    `tolerance` is the largest distance in mm between the faces and their
+    triangles, `angular_tolerance` the largest angle in radians between
+    neighboring triangles of a curved face.
+    """
+    triangles = []
+    explorer = TopExp_Explorer(
+        _meshed(shape, tolerance, angular_tolerance), TopAbs_FACE
+    )
+    while explorer.More():
+        face = TopoDS.Face_s(explorer.Current())
+        explorer.Next()
+        loc = TopLoc_Location()
+        poly = BRep_Tool.Triangulation_s(face, loc)
+        if poly is None:
+            continue
+        trsf = loc.Transformation()
+        nodes = np.array(
+            [
+                poly.Node(i).Transformed(trsf).Coord()
+                for i in range(1, poly.NbNodes() + 1)
+            ]
+        )
+        indices = np.array(
+            [poly.Triangle(i).Get() for i in range(1, poly.NbTriangles() + 1)]
+        )
+        if face.Orientation() == TopAbs_REVERSED:
+            indices = indices[:, ::-1]
+        triangles.append(nodes[indices - 1])
+    if not triangles:
+        raise RuntimeError("Shape could not be tessellated")
+    return _weld(np.concatenate(triangles))
+
+
+def write_stl(
+    part: Shape | Mesh,
+    path: str | os.PathLike,
+    tolerance: float = 1e-3,
+    angular_tolerance: float = 0.1,
+) -> None:
+    """Write a part or a mesh to a binary STL file."""
+    if isinstance(part, Shape):
+        writer = StlAPI_Writer()
+        writer.ASCIIMode = False
+        shape = _meshed(part, tolerance, angular_tolerance)
+        if not writer.Write(shape, os.fspath(path)):
+            raise RuntimeError("Shape could not be tessellated")
+        return
+    mesh = part
+    points = mesh.vertices[mesh.faces]
+    normals = np.cross(
+        points[:, 1] - points[:, 0], points[:, 2] - points[:, 0]
+    )
+    length = np.linalg.norm(normals, axis=1, keepdims=True)
+    data = np.zeros(len(points), dtype=_STL)
+    data["normal"] = np.divide(
+        normals, length, out=np.zeros_like(normals), where=length > 0
+    )
+    data["points"] = points
+    with open(path, "wb") as f:
+        # the header must not start with "solid" as ASCII files do
+        f.write(b"binary STL written by gridfinity".ljust(80, b" "))
+        f.write(struct.pack("<I", len(data)))
+        data.tofile(f)
+
+
+def write_3mf(
+    part: Shape | Mesh,
+    path: str | os.PathLike,
+    tolerance: float = 1e-3,
+    angular_tolerance: float = 0.1,
+) -> None:
+    """Write a part or a mesh to a 3MF file."""
+    write_3mf_instances(
+        [(part, [Location()])], path, tolerance, angular_tolerance
+    )
+
+
+def write_3mf_instances(
+    instances: Sequence[Instances],
+    path: str | os.PathLike,
+    tolerance: float = 1e-3,
+    angular_tolerance: float = 0.1,
+) -> None:
+    """Write parts placed at several locations as one 3MF object.
+
+    Each part is tessellated and written once, its placements are
+    components referring to it.
+    """
+    placements = [
+        (k + 1, loc) for k, (_, locs) in enumerate(instances) for loc in locs
+    ]
+    if not placements:
+        raise ValueError("Nothing to export")
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        z.writestr("_rels/.rels", _RELS)
+        with z.open("3D/3dmodel.model", "w") as f:
+            f.write(_MODEL.encode())
+            for k, (part, _) in enumerate(instances):
+                f.write(f'<object id="{k + 1}" type="model">\n'.encode())
+                _write_mesh(f, _mesh(part, tolerance, angular_tolerance))
+                f.write(b"</object>\n")
+            (object_id, loc), *_ = placements
+            if len(placements) > 1 or not loc.wrapped.IsIdentity():
+                # an object assembled from the placed parts
+                object_id = len(instances) + 1
+                f.write(f'<object id="{object_id}" type="model">\n'.encode())
+                f.write(b"<components>\n")
+                for k, loc in placements:
+                    f.write(
+                        f'<component objectid="{k}" '
+                        f'transform="{_transform(loc)}"/>\n'.encode()
+                    )
+                f.write(b"</components>\n</object>\n")
+            f.write(b"</resources>\n<build>\n")
+            f.write(f'<item objectid="{object_id}"/>\n'.encode())
+            f.write(b"</build>\n</model>\n")
+
+
+def write_step_instances(
+    instances: Sequence[Instances], path: str | os.PathLike
+) -> None:
+    """Write parts placed at several locations as a STEP assembly.
+
+    Each part is written once, its placements are instances of it.
+    """
+    children = []
+    for part, locs in instances:
+        if isinstance(part, Mesh):
+            raise TypeError("Meshes cannot be written to STEP")
+        for loc in locs:
+            # the placed parts share the shape of the part
+            child = Part(part.wrapped.Moved(loc.wrapped))
+            child.label = part.label
+            children.append(child)
+    if not children:
+        raise ValueError("Nothing to export")
+    export_step(Compound(children=children), path)
+
+
+def bin_instances(
+    grid: GridLike,
+    height: float,
+    compartment: (typing.Literal["default"] | Part | None) = "default",
+    stacking_lip: (typing.Literal["default"] | Part | None) = "default",
+    detail: Detail = "print",
+) -> list[Instances]:
+    """A `Bin` split into the cell of its base placed at every cell and
+    the rest of the bin placed once.
+
+    The parts touch but are not fused, slicers and CAD programs merge the
+    components of an object.
+    """
+    grid = Grid(grid)
+    check_detail(detail)
+    if not grid.indices:
+        raise ValueError("Grid does not contain any cells")
+    if detail == "preview":
+        # the base of a preview is a single prism
+        part = _bin(grid, height, compartment, stacking_lip, detail)
+        return [(part, [Location()])]
+
+    def build() -> Part:
+        lip = _bin_lip(grid, stacking_lip, detail)
+        wall = _bin_wall(grid, height, sum(_BASE_PROFILE), detail)
+        return _bin_cut(
+            _bin_shell(wall, lip, height),
+            _bin_compartment(grid, height, compartment, detail),
+            lip,
+            height,
+        )
+
+    top = stored(
+        "Bin.top",
+        dict(
+            grid=grid,
+            height=height,
+            compartment=compartment,
+            stacking_lip=stacking_lip,
+            detail=detail,
+        ),
+        build,
+    )
+    top.label = "bin"
+    cell = Part([cached(("Base", "cell"), _base_cell)])
+    cell.label = "base cell"
+    return [
+        (top, [Location()]),
+        (cell, IrregularGridLocations(42, 42, grid).locations),
+    ]
+
+
+def _meshed(shape: Shape, tolerance: float, angular: float) -> TopoDS_Shape:
+    # the triangulations are stored in the faces, which may be shared with
+    # cached shapes used by other threads. A copy of the topology gets
+    # its own faces on the same geometry
+    copy = BRepBuilderAPI_Copy(shape.wrapped, False, False).Shape()
+    BRepMesh_IncrementalMesh(copy, tolerance, False, angular, True)
+    return copy
+
+
+def _mesh(part: Shape | Mesh, tolerance: float, angular: float) -> Mesh:
+    if isinstance(part, Mesh):
+        return part
+    return tessellate(part, tolerance, angular)
+
+
+def _transform(loc: Location) -> str:
+    # 3MF transforms points as row vectors, the matrix is transposed
+    trsf = loc.wrapped.Transformation()
+    rows = [[trsf.Value(i, j) for i in (1, 2, 3)] for j in (1, 2, 3, 4)]
+    # rounded to drop the noise of rotations and negative zeros
+    return " ".join(f"{round(v, 9) + 0.0:.9g}" for row in rows for v in row)
+
+
+def _write_mesh(f: IO[bytes], mesh: Mesh) -> None:
+    f.write(b"<mesh>\n<vertices>\n")
+    _write_rows(f, '<vertex x="%.4f" y="%.4f" z="%.4f"/>\n', mesh.vertices)
+    f.write(b"</vertices>\n<triangles>\n")
+    _write_rows(f, '<triangle v1="%d" v2="%d" v3="%d"/>\n', mesh.faces)
+    f.write(b"</triangles>\n</mesh>\n")
+
+
+def _write_rows(f: IO[bytes], row: str, values: np.ndarray) -> None:
+    # one formatting operation per chunk instead of one per row
+    for k in range(0, len(values), _CHUNK):
+        chunk = values[k : k + _CHUNK]
+        f.write(((row * len(chunk)) % tuple(chunk.ravel().tolist())).encode())
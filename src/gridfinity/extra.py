@@ -1,23 +1,35 @@
 from typing import Literal
 
 from build123d import (
-    Align,
     Axis,
     BasePartObject,
-    Box,
+    BoundBox,
     BuildPart,
     BuildSketch,
+    Compound,
     Edge,
-    GridLocations,
+    Face,
+    Location,
     Locations,
     Mode,
+    Part,
     Plane,
     Polygon,
+    Rectangle,
+    Sketch,
+    Solid,
+    Vector,
+    Wire,
+    add,
     extrude,
     fillet,
 )
 
-from .main import Grid, GridSketch
+from .booleans import fuse
+from .cache import cached, stored
+from .main import GridSketch, _rounded_wire
+from .profiling import stage
+from .types import Detail, Grid, GridLike, check_detail
 
 Sides = Literal["front", "back", "left", "right"]
 
@@ -25,7 +37,7 @@ Sides = Literal["front", "back", "left", "right"]
 class SubdividedCompartment(BasePartObject):
     def __init__(
         self,
-        grid: Grid,
+        grid: GridLike,
         height: float,
         div_x: int,
         div_y: int,
@@ -35,58 +47,29 @@ class SubdividedCompartment(BasePartObject):
         scoops: list[Sides] | None = None,
         scoop_radius: float = 7.0,
         wall_thickness=1.0,
+        detail: Detail = "print",
         mode=Mode.PRIVATE,
         **kwargs,
     ):
-        grid_sketch = GridSketch(
-            grid, inset=0.25 + wall_thickness, with_fillet=False
-        )
-        size = grid_sketch.bounding_box().size
-
-        with BuildPart() as p:
-            extrude(grid_sketch, amount=-height)
-
-            with BuildPart(mode=Mode.SUBTRACT) as p2:
-                _align = (Align.CENTER, Align.CENTER, Align.MAX)
-                cut_edges: list[Edge] = []
-                grid_w = size.X / div_x
-                grid_h = size.Y / div_y
-                if div_y > 1:
-                    with GridLocations(grid_w, grid_h, div_x, div_y - 1):
-                        Box(grid_w, 1, height, align=_align)
-                        cut_size = min(div_cutout_width, grid_w - 10)
-                        if cut_size > 0:
-                            cut = Box(
-                                length=cut_size,
-                                width=1,
-                                height=div_cutout_height,
-                                align=_align,
-                                mode=Mode.SUBTRACT,
-                            )
-                            cut_edges += cut.edges().filter_by(Axis.Y)
-                if div_x > 1:
-                    with GridLocations(grid_w, grid_h, div_x - 1, div_y):
-                        Box(1, grid_h, height, align=_align)
-                        cut_size = min(div_cutout_width, grid_h - 10)
-                        if cut_size > 0:
-                            cut = Box(
-                                length=1,
-                                width=cut_size,
-                                height=div_cutout_height,
-                                align=_align,
-                                mode=Mode.SUBTRACT,
-                            )
-                            cut_edges += cut.edges().filter_by(Axis.X)
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
 
-                if len(cut_edges):
-                    fillet(cut_edges, radius=2)
-                if div_x > 1 or div_y > 1:
-                    _ez = p2.edges().group_by(Axis.Z)[-1]
-                    _ef = [e for e in _ez if e.length > 1]
-                    fillet(_ef, radius=0.45)
+        def build() -> Part:
+            grid_sketch = GridSketch(
+                grid, inset=0.25 + wall_thickness, with_fillet=False
+            )
+            bbox = grid_sketch.bounding_box()
+            size = bbox.size
+            radius = 4 - 0.25 - wall_thickness
+            grid_w = size.X / div_x
+            grid_h = size.Y / div_y
 
-                if with_label:
-                    # Label Cutout
+            label = None
+            if with_label:
+                # Label Cutout
+                with BuildPart() as lp:
                     with (
                         BuildSketch(Plane.XZ.offset(-size.Y / 2)) as s,
                         Locations((size.X / 2, 0, 0)),
@@ -95,37 +78,606 @@ class SubdividedCompartment(BasePartObject):
                         # 1:0.7 equals about 55 degrees overhang
                         _h = min(_w * 0.7, height - 2.2)
                         Polygon((0, 0), (-_w, 0), (0, -_h), align=None)
-                        fillet(s.vertices().sort_by(Axis.X)[0], radius=0.6)
+                        if detail == "print":
+                            fillet(s.vertices().sort_by(Axis.X)[0], radius=0.6)
                     extrude(amount=size.Y)
+                label = lp.part
+
+            # all dividers are drawn as a single lattice sketch
+            rows = [(j - (div_y - 2) / 2) * grid_h for j in range(div_y - 1)]
+            cols = [(i - (div_x - 2) / 2) * grid_w for i in range(div_x - 1)]
+            with BuildSketch() as strips:
+                if rows:
+                    with Locations(*[(0, y) for y in rows]):
+                        Rectangle(size.X, 1)
+                if cols:
+                    with Locations(*[(x, 0) for x in cols]):
+                        Rectangle(1, size.Y)
+
+            with BuildSketch() as pockets:
+                add(grid_sketch)
+                if rows or cols:
+                    add(strips.sketch, mode=Mode.SUBTRACT)
+
+            # the top rounds of the dividers belong to the pockets next to
+            # them, they are interrupted by the finger cutouts
+            r_cut, r_top = (2, 0.45) if detail == "print" else (0, 0)
+            slots_x = [(i - (div_x - 1) / 2) * grid_w for i in range(div_x)]
+            slots_y = [(j - (div_y - 1) / 2) * grid_h for j in range(div_y)]
+            cut_x = min(div_cutout_width, grid_w - 10)
+            cut_y = min(div_cutout_width, grid_h - 10)
+            gaps_x = _gaps(slots_x, cut_x, div_cutout_height, r_cut)
+            gaps_y = _gaps(slots_y, cut_y, div_cutout_height, r_cut)
 
-            wall_inset = -(1.8 + 0.8 - wall_thickness)
             sides = [] if scoops is None else set(scoops)
-            for side in sides:
-                axis = "x" if side == "front" or side == "back" else "y"
-                group_index = 0 if side == "back" or side == "right" else -1
-                face_filter = Plane.YZ if axis == "x" else Plane.XZ
-                edge_filter = Axis.Y if axis == "x" else Axis.X
-                group_axis = Axis.X if axis == "x" else Axis.Y
-                _fs = (
-                    p.faces()
-                    .filter_by(face_filter)
-                    .group_by(group_axis)[group_index]
-                )
-                for _f in _fs:
-                    extrude(_f, amount=wall_inset, mode=Mode.SUBTRACT)
-                _e = (
-                    p.edges()
-                    .filter_by(edge_filter)
-                    .group_by(Axis.Z)[0]
-                    .group_by(group_axis)[group_index]
-                )
+            solids: list[Solid] = []
+            with stage("SubdividedCompartment.pockets"):
+                for face in pockets.sketch.faces():
+                    fb = face.bounding_box()
+                    ears = (
+                        _ears(face, rows, cols, gaps_x, gaps_y, radius)
+                        if r_top > 0
+                        else ((), ())
+                    )
+                    scooped = [
+                        side
+                        for side in sides
+                        if abs(_extent(fb, side) - _extent(bbox, side)) < 1e-6
+                    ]
+                    if scooped or (
+                        label is not None and fb.max.X > size.X / 2 - 14
+                    ):
+                        solids.append(
+                            _detailed_pocket(
+                                face,
+                                height,
+                                radius if detail == "print" else 0,
+                                label,
+                                scooped,
+                                -(1.8 + 0.8 - wall_thickness),
+                                scoop_radius if detail == "print" else 0,
+                                ears,
+                                r_top,
+                            )
+                        )
+                    else:
+                        solids.append(
+                            _pocket(
+                                face,
+                                height,
+                                radius if detail == "print" else 0,
+                                ears,
+                                r_top,
+                            )
+                        )
+
+            # the finger cutouts connect the pockets, they are placed on
+            # the pieces of the walls between their crossings
+            if (rows and gaps_x) or (cols and gaps_y):
+                with stage("SubdividedCompartment.dividers"):
+                    walls = grid_sketch & strips.sketch
+                    length = max(size.X, size.Y) + 2
+                    details = []
+                    if rows and gaps_x:
+                        if cols:
+                            walls_x = walls - _bars(cols, 1, length)
+                        else:
+                            walls_x = walls
+                        details += _wall_cutouts(
+                            walls_x,
+                            rows,
+                            slots_x,
+                            cut_x,
+                            div_cutout_height,
+                            r_cut,
+                            r_top,
+                            height,
+                        )
+                    if cols and gaps_y:
+                        if rows:
+                            walls_y = walls - _bars(rows, 1, length, False)
+                        else:
+                            walls_y = walls
+                        # walls along y are handled as walls along x rotated
+                        # by 90 degrees
+                        rotated = _wall_cutouts(
+                            walls_y.rotate(Axis.Z, -90),
+                            [-x for x in cols],
+                            slots_y,
+                            cut_y,
+                            div_cutout_height,
+                            r_cut,
+                            r_top,
+                            height,
+                        )
+                        turn = Location((0, 0, 0), (0, 0, 1), 90)
+                        details += [
+                            Solid(d.wrapped.Moved(turn.wrapped))
+                            for d in rotated
+                        ]
+                    if label is not None:
+                        x0 = label.bounding_box().min.X
+                        details = [
+                            t
+                            for d in details
+                            for t in (
+                                (d - label).solids()
+                                if d.bounding_box(optimal=False).max.X > x0
+                                else [d]
+                            )
+                        ]
+                    solids += details
+
+            return Part(Compound(solids))
+
+        part = stored(
+            "SubdividedCompartment",
+            dict(
+                grid=grid,
+                height=height,
+                div_x=div_x,
+                div_y=div_y,
+                div_cutout_width=div_cutout_width,
+                div_cutout_height=div_cutout_height,
+                with_label=with_label,
+                scoops=None if scoops is None else set(scoops),
+                scoop_radius=scoop_radius,
+                wall_thickness=wall_thickness,
+                detail=detail,
+            ),
+            build,
+        )
+        super().__init__(part=part, mode=mode, **kwargs)
+
+
+def _extent(bbox: BoundBox, side: str) -> float:
+    # the side of a compartment a scoop is added to
+    return {
+        "front": bbox.max.X,
+        "back": bbox.min.X,
+        "left": bbox.max.Y,
+        "right": bbox.min.Y,
+    }[side]
+
+
+# the parts of the outline of a pocket along the dividers as (start, end,
+# direction towards the divider) and the corners between two of them as
+# (corner, direction towards the one divider, towards the other)
+Ears = tuple[
+    tuple[tuple[Vector, Vector, Vector], ...],
+    tuple[tuple[Vector, Vector, Vector], ...],
+]
+
+
+def _gaps(
+    slots: list[float], cut_width: float, cut_height: float, r_cut: float
+) -> list[tuple[float, float]]:
+    # the ranges along a wall taken by the finger cutouts centered on the
+    # `slots` and the rounds of their rims
+    if cut_width <= 0 or cut_height <= 0:
+        return []
+    half = cut_width / 2 + min(r_cut, cut_width / 2, cut_height / 2)
+    return [(x - half, x + half) for x in slots]
+
+
+def _ears(
+    face: Face,
+    rows: list[float],
+    cols: list[float],
+    gaps_x: list[tuple[float, float]],
+    gaps_y: list[tuple[float, float]],
+    radius: float,
+) -> Ears:
+    # the top rounds of the dividers at y = `rows` and x = `cols` next to
+    # a pocket, interrupted by the cutouts. Pieces between a corner of the
+    # pocket and a cutout are left out if the corner fillet of `radius`
+    # would run into their end
+    points = [e @ 0 for e in face.outer_wire().order_edges()]
+    area = sum(
+        p.X * q.Y - q.X * p.Y
+        for p, q in zip(points, points[1:] + points[:1], strict=True)
+    )
+    turn = 1 if area > 0 else -1
+    segments = []
+    # the direction towards the divider at the start and the end of each
+    # edge if the round reaches them
+    reach: list[tuple[Vector | None, Vector | None]] = []
+    for k, p in enumerate(points):
+        q = points[(k + 1) % len(points)]
+        d = (q - p).normalized()
+        # the edges along the dividers are along x or y
+        n = Vector(round(d.Y), -round(d.X)) * turn
+        if round(d.Y) == 0 and any(
+            abs(p.Y + n.Y / 2 - y) < 1e-6 for y in rows
+        ):
+            axis, gaps = 0, gaps_x
+        elif round(d.X) == 0 and any(
+            abs(p.X + n.X / 2 - x) < 1e-6 for x in cols
+        ):
+            axis, gaps = 1, gaps_y
+        else:
+            reach.append((None, None))
+            continue
+        start, end = tuple(p)[axis], tuple(q)[axis]
+        free = [(min(start, end), max(start, end))]
+        for a, b in gaps:
+            free = [
+                part
+                for u, v in free
+                for part in ((u, min(v, a)), (max(u, b), v))
+                if part[1] - part[0] > 1e-6
+            ]
+        lo, hi = min(start, end), max(start, end)
+        free = [
+            (u, v)
+            for u, v in free
+            if v - u >= radius or (abs(u - lo) < 1e-6) == (abs(v - hi) < 1e-6)
+        ]
+        for u, v in free:
+            segments.append(
+                (p + d * abs(u - start), p + d * abs(v - start), n)
+            )
+        reach.append(
+            tuple(
+                n if any(u - 1e-6 < t < v + 1e-6 for u, v in free) else None
+                for t in (start, end)
+            )
+        )
+    corners = []
+    for k, c in enumerate(points):
+        n1, n2 = reach[k - 1][1], reach[k][0]
+        if n1 is None or n2 is None:
+            continue
+        d1 = c - points[k - 1]
+        d2 = points[(k + 1) % len(points)] - c
+        # only convex corners, the rounds overlap at concave ones
+        if d1.cross(d2).Z * turn > 0:
+            corners.append((c, n1, n2))
+    return tuple(segments), tuple(corners)
+
+
+def _ear_along(a: Vector, b: Vector, n: Vector, radius: float) -> Solid:
+    # the top round of a divider from `a` to `b`, the divider is in the
+    # direction `n`
+    d = b - a
+    z_dir = d if d.cross(n).Z > 0 else -d
+    plane = Plane(origin=a, x_dir=n, z_dir=z_dir)
+    return Solid.extrude(plane * _ear(0, -1, radius), d)
+
+
+def _prism(face: Face, height: float, ears: Ears, radius: float) -> Part:
+    # a pocket with the top rounds of the dividers next to it, the rounds
+    # of two dividers meet on the diagonal of their crossing
+    segments, corners = ears
+    prism = extrude(face, amount=-height)
+    rounds = [_ear_along(a, b, n, radius) for a, b, n in segments]
+    for c, n1, n2 in corners:
+        rounds += (
+            _ear_along(c, c + n2 * radius, n1, radius)
+            & _ear_along(c, c + n1 * radius, n2, radius)
+        ).solids()
+    return fuse(prism, rounds)
+
+
+def _round(p: BuildPart, radius: float, r_top: float) -> None:
+    # fillet the vertical and the bottom edges of a pocket, not those
+    # where the top rounds of the dividers end at a cutout
+    z_edges = [
+        e for e in p.edges().filter_by(Axis.Z) if e.length > r_top + 1e-6
+    ]
+    btm_faces = p.faces().group_by(Axis.Z)[0]
+    btm_edges = [e for btm_face in btm_faces for e in btm_face.edges()]
+    fillet(btm_edges + z_edges, radius=radius)
+
+
+def _pocket(
+    face: Face, height: float, radius: float, ears: Ears, r_top: float
+) -> Solid:
+    # the pockets of regular subdivisions are alike, each shape is only
+    # built once at the origin, in the quarter turn with the smallest key,
+    # and then turned and placed
+    center = face.bounding_box().center()
+    face = face.moved(Location(-center))
+    ears = (
+        tuple((a - center, b - center, n) for a, b, n in ears[0]),
+        tuple((c - center, n1, n2) for c, n1, n2 in ears[1]),
+    )
+    turns = min(range(4), key=lambda k: _pocket_key(face, ears, k))
+    face = face.rotate(Axis.Z, 90 * turns)
+    ears = _turn_ears(ears, turns)
+
+    def build() -> Solid:
+        size = face.bounding_box().size
+        r = min(radius, 0.49 * min(size.X, size.Y))
+        if ears[0] or ears[1]:
+            # the rounds of the dividers need a fillet of the pocket like
+            # `_detailed_pocket`
+            with BuildPart() as p:
+                add(_prism(face, height, ears, r_top))
+                if r > 0:
+                    _round(p, r, r_top)
+            return p.solids()[0]
+        wires = [
+            _rounded_wire([e @ 0 for e in w.order_edges()], r)
+            for w in [face.outer_wire(), *face.inner_wires()]
+        ]
+        with BuildPart() as p:
+            extrude(Face(wires[0], wires[1:]), amount=-height)
+            if r > 0:
+                fillet(p.faces().sort_by(Axis.Z)[0].edges(), radius=r)
+        return p.solids()[0]
+
+    pocket = cached(
+        (
+            "SubdividedCompartment",
+            "pocket",
+            *_pocket_key(face, ears, 0),
+            height,
+            radius,
+            r_top,
+        ),
+        build,
+    )
+    loc = Location(center) * Location((0, 0, 0), (0, 0, 1), -90 * turns)
+    return Solid(pocket.wrapped.Moved(loc.wrapped))
+
+
+def _turn(v: Vector, turns: int) -> Vector:
+    # `v` turned by quarter turns about the z axis
+    for _ in range(turns % 4):
+        v = Vector(-v.Y, v.X, v.Z)
+    return v
+
+
+def _turn_ears(ears: Ears, turns: int) -> Ears:
+    segments, corners = ears
+    return (
+        tuple(tuple(_turn(v, turns) for v in e) for e in segments),
+        tuple(tuple(_turn(v, turns) for v in e) for e in corners),
+    )
+
+
+def _pocket_key(face: Face, ears: Ears, turns: int) -> tuple:
+    # the outline and the ears of a pocket at the origin turned by
+    # quarter turns, rounded and sorted to compare alike pockets
+    def rounded(v: Vector) -> tuple[float, ...]:
+        return tuple(round(x, 6) + 0.0 for x in _turn(v, turns))
+
+    # the rounds are the same whichever way their ends and the
+    # directions of the dividers are listed
+    shape = tuple(sorted(rounded(v.center()) for v in face.vertices()))
+    segments = sorted(
+        (*sorted((rounded(a), rounded(b))), rounded(n)) for a, b, n in ears[0]
+    )
+    corners = sorted(
+        (rounded(c), *sorted((rounded(n1), rounded(n2))))
+        for c, n1, n2 in ears[1]
+    )
+    return shape, tuple(segments), tuple(corners)
+
+
+def _detailed_pocket(
+    face: Face,
+    height: float,
+    radius: float,
+    label: Part | None,
+    scoops: list[str],
+    wall_inset: float,
+    scoop_radius: float,
+    ears: Ears,
+    r_top: float,
+) -> Solid:
+    with BuildPart() as p:
+        add(_prism(face, height, ears, r_top))
+        if label is not None:
+            add(label, mode=Mode.SUBTRACT)
+
+        for side in scoops:
+            axis = "x" if side == "front" or side == "back" else "y"
+            group_index = 0 if side == "back" or side == "right" else -1
+            face_filter = Plane.YZ if axis == "x" else Plane.XZ
+            edge_filter = Axis.Y if axis == "x" else Axis.X
+            group_axis = Axis.X if axis == "x" else Axis.Y
+            _fs = (
+                p.faces()
+                .filter_by(face_filter)
+                .group_by(group_axis)[group_index]
+            )
+            for _f in _fs:
+                extrude(_f, amount=wall_inset, mode=Mode.SUBTRACT)
+            _e = (
+                p.edges()
+                .filter_by(edge_filter)
+                .group_by(Axis.Z)[0]
+                .group_by(group_axis)[group_index]
+            )
+            if scoop_radius > 0:
                 fillet(_e, radius=scoop_radius)
 
-            # fillet all z edges and all of bottom faces
-            z_edges = p.edges().filter_by(Axis.Z)
-            btm_faces = p.faces().group_by(Axis.Z)[0]
-            btm_edges = [e for btm_face in btm_faces for e in btm_face.edges()]
-            fillet(btm_edges + z_edges, radius=4 - 0.25 - wall_thickness)
+        # fillet all z edges and all of bottom faces
+        if radius > 0:
+            _round(p, radius, r_top)
+    return p.solids()[0]
+
+
+def _bars(
+    positions: list[float], width: float, length: float, vertical=True
+) -> Sketch:
+    # rectangles centered on the axis at x = `positions`, or y if not
+    # `vertical`
+    with BuildSketch() as s:
+        if vertical:
+            with Locations(*[(p, 0) for p in positions]):
+                Rectangle(width, length)
+        else:
+            with Locations(*[(0, p) for p in positions]):
+                Rectangle(length, width)
+    return s.sketch
 
-        assert p.part is not None
-        super().__init__(part=p.part, mode=mode, **kwargs)
+
+def _wall_cutouts(
+    walls: Sketch,
+    rows: list[float],
+    slots: list[float],
+    cut_width: float,
+    cut_height: float,
+    r_cut: float,
+    r_top: float,
+    height: float,
+) -> list[Solid]:
+    # finger cutouts of the walls along x at y = `rows` centered on the
+    # `slots` along x. The cutouts of a straight piece of a wall are built
+    # once for its length and placed, only irregular pieces need booleans.
+    r_cut = min(r_cut, cut_width / 2, cut_height / 2)
+    half = cut_width / 2 + r_cut
+    solids: list[Solid] = []
+    irregular = []
+    for face in walls.faces():
+        span = _span(face)
+        if span is None:
+            irregular.append(face)
+            continue
+        x0, x1, y = span
+        offsets = tuple(
+            round(x - x0, 6)
+            for x in slots
+            if x + half > x0 + 1e-6 and x - half < x1 - 1e-6
+        )
+        if not offsets:
+            continue
+        cutouts = cached(
+            (
+                "SubdividedCompartment",
+                "cutouts",
+                round(x1 - x0, 6),
+                offsets,
+                cut_width,
+                cut_height,
+                r_cut,
+                r_top,
+            ),
+            lambda n=x1 - x0, o=offsets: _piece_cutouts(
+                n, o, cut_width, cut_height, r_cut, r_top
+            ),
+        )
+        loc = Location((x0, y))
+        solids += [Solid(t.wrapped.Moved(loc.wrapped)) for t in cutouts]
+    if not irregular:
+        return solids
+
+    walls = Sketch(irregular)
+    body = extrude(walls, amount=-height)
+    cutout = _cutout(cut_width, cut_height, r_cut, r_top)
+    bbox = walls.bounding_box()
+    for y in rows:
+        for x in slots:
+            if bbox.min.X < x + half and x - half < bbox.max.X:
+                loc = Location((x, y))
+                solids += [
+                    t
+                    for c in cutout
+                    for t in (
+                        Solid(c.wrapped.Moved(loc.wrapped)) & body
+                    ).solids()
+                ]
+    return solids
+
+
+def _span(face: Face) -> tuple[float, float, float] | None:
+    # x range and center y of a rectangular wall piece along x
+    bbox = face.bounding_box()
+    size = bbox.size
+    if abs(size.Y - 1) > 1e-6 or abs(face.area - size.X * size.Y) > 1e-6:
+        return None
+    return bbox.min.X, bbox.max.X, bbox.center().Y
+
+
+def _piece_cutouts(
+    length: float,
+    offsets: tuple[float, ...],
+    cut_width: float,
+    cut_height: float,
+    r_cut: float,
+    r_top: float,
+) -> list[Solid]:
+    # cutouts of a straight wall piece along x starting at the origin at
+    # the `offsets`, fused so that they are few tools for the bin instead
+    # of many touching ones
+    solids: list[Solid] = []
+    half = cut_width / 2 + r_cut
+    cutout = _cutout(cut_width, cut_height, r_cut, r_top)
+    piece = Solid.make_box(length, 1, cut_height + 1).moved(
+        Location((0, -0.5, -cut_height - 1))
+    )
+    for x in offsets:
+        placed = [c.moved(Location((x, 0))) for c in cutout]
+        if x - half < -1e-6 or x + half > length + 1e-6:
+            placed = [t for c in placed for t in (c & piece).solids()]
+        solids += placed
+    if len(solids) > 1:
+        solids = (Part() + solids).clean().solids()
+    return solids
+
+
+def _cutout(
+    width: float, depth: float, radius: float, round_radius: float
+) -> list[Solid]:
+    # a finger cutout through a wall along x at the origin, the top edges
+    # of the wall faces are rounded along its rim
+    rim = _rim(width, depth, radius)
+    start, end = rim @ 0, rim @ 1
+    face = Face(Wire([*rim.edges(), Edge.make_line(end, start)]))
+    solids = [extrude(Plane.XZ * face, amount=0.5, both=True).solids()[0]]
+    if round_radius > 0:
+        for side in (1, -1):
+            path = Plane(
+                origin=(0, side * 0.5, 0), x_dir=(1, 0, 0), z_dir=(0, -1, 0)
+            )
+            profile = Plane.YZ.offset(start.X) * _ear(
+                side * 0.5, side, round_radius
+            )
+            solids.append(Solid.sweep(profile, path * rim))
+    return solids
+
+
+def _rim(width: float, depth: float, radius: float) -> Wire:
+    # rim of a finger cutout below y = 0 with rounded bottom corners, its
+    # top corners are rounded outwards into the wall
+    w, d, r = width / 2, depth, radius
+    if r <= 0:
+        return Wire.make_polygon(
+            [(-w, 0), (-w, -d), (w, -d), (w, 0)], close=False
+        )
+    q = r * (1 - 2**-0.5)
+    arcs = [
+        ((-w - r, 0), (-w - q, -r + r * 2**-0.5), (-w, -r)),
+        ((-w, -d + r), (-w + q, -d + q), (-w + r, -d)),
+        ((w - r, -d), (w - q, -d + q), (w, -d + r)),
+        ((w, -r), (w + q, -r + r * 2**-0.5), (w + r, 0)),
+    ]
+    edges = []
+    for k, arc in enumerate(arcs):
+        if k > 0 and (Vector(*arc[0]) - Vector(*arcs[k - 1][2])).length > 1e-9:
+            edges.append(Edge.make_line(arcs[k - 1][2], arc[0]))
+        edges.append(Edge.make_three_point_arc(*arc))
+    return Wire(edges)
+
+
+def _ear(y: float, side: int, radius: float) -> Face:
+    # material removed by rounding the top edge of a wall face at `y`,
+    # the wall is on the opposite `side` of the face
+    r = radius
+    c = Vector(y - side * r, -r)
+    return Face(
+        Wire(
+            [
+                Edge.make_line((y, 0), (y, -r)),
+                Edge.make_three_point_arc(
+                    (y, -r),
+                    c + Vector(side * r * 2**-0.5, r * 2**-0.5),
+                    (y - side * r, 0),
+                ),
+                Edge.make_line((y - side * r, 0), (y, 0)),
+            ]
+        )
+    )
@@ -0,0 +1,194 @@
+"""Build every bin of a parameter sweep while sharing their intermediates.
+
+    space = gf.family.plan(
+        grid=[f"{w}x{h}" for w in range(1, 7) for h in range(1, 7)],
+        height=[21, 42, 63, 84],
+        compartment=["default", {"div_x": 2, "div_y": 2}],
+    )
+    for member, part in gf.family.generate(space, workers=4):
+        export_stl(part, gf.family.name(member) + ".stl")
+
+The bins are grouped by grid. The base, the stacking lip and the grid
+sketches of a grid are built once for its whole group and only the
+stages depending on the height and the compartment are built for each
+bin (see `ParametricBin`). A group is built by a single process, so even
+across processes every intermediate is built exactly once.
+
+`compartment` is `"default"`, `None` or the arguments of an
+`extra.SubdividedCompartment` whose height defaults to the bin height
+minus 7 mm, `stacking_lip` is `"default"` or `None`.
+"""
+
+import dataclasses
+import itertools
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any
+
+from build123d import Part
+
+from .batch import digest, parse_grid
+from .cache import deserialize, serialize
+from .extra import SubdividedCompartment
+from .parametric import ParametricBin
+from .types import Grid, check_detail
+
+Member = dict[str, Any]
+
+_AXES = ("grid", "height", "compartment", "stacking_lip", "detail")
+
+
+@dataclasses.dataclass(frozen=True)
+class Plan:
+    """The bins of a sweep grouped by the grid they share."""
+
+    groups: tuple[tuple[Grid, tuple[Member, ...]], ...]
+
+    def __len__(self) -> int:
+        return sum(len(members) for _, members in self.groups)
+
+    def intermediates(self) -> list[tuple[Any, ...]]:
+        """The shared parts and sketches, each of them is built once."""
+        result: list[tuple[Any, ...]] = []
+        for grid, members in self.groups:
+            details = sorted({m["detail"] for m in members})
+            for detail in details:
+                result.append(("Base", grid, detail))
+                if any(m["stacking_lip"] == "default" for m in members):
+                    result.append(("StackingLip", grid, detail))
+            # sketches only differ by their inset and whether the corners
+            # are rounded, which they are not for previews
+            sketches = set()
+            for m in members:
+                rounded = m["detail"] == "print"
+                sketches.add((0.25, rounded))
+                if m["compartment"] == "default":
+                    sketches.add((1.25, rounded))
+                elif m["compartment"] is not None:
+                    thickness = m["compartment"].get("wall_thickness", 1.0)
+                    sketches.add((0.25 + thickness, False))
+            for inset, rounded in sorted(sketches):
+                result.append(("GridSketch", grid, inset, rounded))
+        return result
+
+
+def plan(
+    grid: Iterable[Any],
+    height: Iterable[float],
+    compartment: Iterable[Any] = ("default",),
+    stacking_lip: Iterable[Any] = ("default",),
+    detail: Iterable[str] = ("print",),
+) -> Plan:
+    """Plan the builds of every combination of the given values."""
+    axes = [grid, height, compartment, stacking_lip, detail]
+    groups: dict[Grid, dict[str, Member]] = {}
+    for values in itertools.product(*(list(a) for a in axes)):
+        member = _normalize(dict(zip(_AXES, values, strict=True)))
+        members = groups.setdefault(member["grid"], {})
+        # equal members are only built once
+        members.setdefault(_key(member), member)
+    return Plan(
+        tuple(
+            (g, tuple(sorted(members.values(), key=_order)))
+            for g, members in groups.items()
+        )
+    )
+
+
+def generate(
+    space: Plan, workers: int | None = 0
+) -> Iterator[tuple[Member, Part]]:
+    """Build the bins of a plan and yield them with their parameters.
+
+    With `workers=0` the bins are built in this process in the order of
+    the plan. Otherwise the groups are built by up to `workers` processes
+    (default number of CPUs) and are yielded as they are finished. At
+    most two groups per process are built ahead of the consumer.
+    """
+    if workers == 0:
+        for _, members in space.groups:
+            yield from _build(members)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        ahead = 2 * workers
+        groups = iter(space.groups)
+        pending = set()
+        while True:
+            for _, members in itertools.islice(groups, ahead - len(pending)):
+                pending.add(pool.submit(_build_all, members))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                for member, data in future.result():
+                    yield member, deserialize(data)
+
+
+def name(member: Mapping[str, Any]) -> str:
+    """A file name identifying a member of a sweep."""
+    n_cols, n_rows = member["grid"].size
+    spec = {**member, "grid": [list(row) for row in member["grid"]]}
+    return f"bin_{n_cols}x{n_rows}_h{member['height']:g}_{digest(spec)[:8]}"
+
+
+def _build(members: Iterable[Member]) -> Iterator[tuple[Member, Part]]:
+    b: ParametricBin | None = None
+    for member in members:
+        params = {**member, "compartment": _compartment(member)}
+        if b is None:
+            b = ParametricBin(**params)
+        else:
+            b.set(**params)
+        yield member, b.part
+
+
+def _build_all(members: Iterable[Member]) -> list[tuple[Member, bytes]]:
+    # pickled parts are written in a binary format that OCCT sometimes
+    # fails to read back
+    return [(m, serialize(part)) for m, part in _build(members)]
+
+
+def _compartment(member: Member) -> str | Part | None:
+    compartment = member["compartment"]
+    if not isinstance(compartment, Mapping):
+        return compartment
+    return SubdividedCompartment(
+        **{
+            "height": member["height"] - 7,
+            "detail": member["detail"],
+            **compartment,
+            "grid": member["grid"],
+        }
+    )
+
+
+def _normalize(member: Member) -> Member:
+    member["grid"] = parse_grid(member["grid"])
+    check_detail(member["detail"])
+    for key in ("compartment", "stacking_lip"):
+        if member[key] is False:
+            member[key] = None
+    if isinstance(member["compartment"], Mapping):
+        member["compartment"] = dict(member["compartment"])
+    elif member["compartment"] not in ("default", None):
+        raise ValueError(f"Invalid compartment: {member['compartment']!r}")
+    if member["stacking_lip"] not in ("default", None):
+        raise ValueError(f"Invalid stacking lip: {member['stacking_lip']!r}")
+    return member
+
+
+def _key(member: Member) -> str:
+    return digest({**member, "grid": [list(row) for row in member["grid"]]})
+
+
+def _order(member: Member) -> tuple[Any, ...]:
+    # bins with the same detail and lip follow each other, the base and
+    # the lip are then only built again when the detail or lip changes
+    return (
+        member["detail"],
+        member["stacking_lip"] is None,
+        member["height"],
+    )
@@ -1,145 +1,599 @@
+import copy
+import math
+import threading
 import typing
 
 from build123d import (
+    Align,
     Axis,
     BasePartObject,
     BaseSketchObject,
+    BoundBox,
     BuildPart,
     BuildSketch,
+    Compound,
+    Edge,
     Face,
-    Kind,
-    Locations,
+    Location,
     Mode,
     Part,
     Plane,
+    Polygon,
     Rectangle,
+    Rotation,
+    RotationLike,
+    Solid,
+    Vector,
     Wire,
     add,
     extrude,
     fillet,
-    offset,
 )
+from build123d.topology import tuplify
+from OCP.Bnd import Bnd_Box
+from OCP.gp import gp_Pnt
 
-from .types import Grid
+from .cache import cached, stored
+from .outline import Loop, corners, regions
+from .profiling import stage
+from .types import Detail, Grid, GridLike, check_detail
 from .utils import IrregularGridLocations, faces_xy
 
 
 class Bin(BasePartObject):
     def __init__(
         self,
-        grid: Grid,
+        grid: GridLike,
         height: float,
         compartment: (typing.Literal["default"] | Part | None) = "default",
         stacking_lip: (typing.Literal["default"] | Part | None) = "default",
+        detail: Detail = "print",
         **kwargs,
     ):
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
+        part = _bin(grid, height, compartment, stacking_lip, detail)
+        super().__init__(part=part, **kwargs)
 
-        with BuildPart() as p:
-            # Base
-            base = Base(grid=grid)
-            base_height = base.bounding_box().size.Z
+    @staticmethod
+    def spec(
+        grid: GridLike,
+        height: float,
+        compartment: (typing.Literal["default"] | Part | None) = "default",
+        stacking_lip: (typing.Literal["default"] | Part | None) = "default",
+        detail: Detail = "print",
+        rotation: RotationLike = (0, 0, 0),
+        align: Align | tuple[Align, Align, Align] | None = None,
+    ) -> "LazyBin":
+        """A bin that is only built when its shape is first used."""
+        return LazyBin(
+            grid, height, compartment, stacking_lip, detail, rotation, align
+        )
+
+
+class LazyBin(Part):
+    """A `Bin` that is built when its shape is first used.
+
+    The parameters are checked right away and kept in `params`, the
+    bounding box of a bin with the default stacking lip is known without
+    building it. Once built the shape is kept. Copies of a bin that is
+    not built yet are not built either, pickles are built anew from the
+    parameters. Unlike `Bin` it is never added to a `BuildPart` context.
+    """
+
+    def __init__(
+        self,
+        grid: GridLike,
+        height: float,
+        compartment: (typing.Literal["default"] | Part | None) = "default",
+        stacking_lip: (typing.Literal["default"] | Part | None) = "default",
+        detail: Detail = "print",
+        rotation: RotationLike = (0, 0, 0),
+        align: Align | tuple[Align, Align, Align] | None = None,
+    ):
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
+        self.__dict__.update(
+            params=dict(
+                grid=grid,
+                height=height,
+                compartment=compartment,
+                stacking_lip=stacking_lip,
+                detail=detail,
+            ),
+            _rotation=rotation,
+            _align=align,
+            _wrapped=None,
+            # the thread building the bin, others wait for it on the lock
+            _building=None,
+            _lock=_BuildLock(),
+        )
+        # the label, the color and the children of an empty part, the
+        # shape is set once the bin is built
+        Part.__init__(self)
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{k}={v!r}" for k, v in self._args().items())
+        return f"{type(self).__name__}({args})"
+
+    def __reduce__(self):
+        # the bin is built anew from its parameters
+        return type(self), tuple(self._args().values()), {"label": self.label}
+
+    def __copy__(self) -> "LazyBin":
+        if self.built:
+            # shares the shape like the copy of any part
+            return super().__copy__()
+        result = type(self)(**self._args())
+        result.label, result.color = self.label, self.color
+        return result
+
+    def __deepcopy__(self, memo) -> "LazyBin":
+        if self.built:
+            return super().__deepcopy__(memo)
+        result = type(self)(**copy.deepcopy(self._args(), memo))
+        result.label = self.label
+        result.color = copy.deepcopy(self.color, memo)
+        return result
+
+    @property
+    def built(self) -> bool:
+        return self.__dict__.get("_wrapped") is not None
+
+    @property  # type: ignore[override]
+    def wrapped(self):
+        if not self.built and self._building != threading.get_ident():
+            self._build()
+        return self._wrapped
+
+    @wrapped.setter
+    def wrapped(self, value) -> None:
+        self.__dict__["_wrapped"] = value
+
+    def bounding_box(
+        self, tolerance: float | None = None, optimal: bool = True
+    ) -> BoundBox:
+        analytic = (
+            self._rotation == (0, 0, 0)
+            and self._align is None
+            and not isinstance(self.params["stacking_lip"], Part)
+        )
+        if self.built or not analytic:
+            return super().bounding_box(tolerance, optimal)
+        from .estimate import bin_bounds
+
+        params = self.params
+        low, high = bin_bounds(
+            params["grid"],
+            params["height"],
+            params["stacking_lip"] is not None,
+        )
+        return BoundBox(Bnd_Box(gp_Pnt(*low), gp_Pnt(*high)))
+
+    def _args(self) -> dict[str, typing.Any]:
+        return dict(self.params, rotation=self._rotation, align=self._align)
+
+    def _build(self) -> None:
+        with self._lock:
+            if self.built:
+                return
+            self.__dict__["_building"] = threading.get_ident()
+            try:
+                part = _bin(**self.params)
+                # placed like a `BasePartObject` outside of a builder
+                if self._align is not None:
+                    offset = part.bounding_box().to_align_offset(
+                        tuplify(self._align, 3)
+                    )
+                    part.move(Location(offset))
+                rotation = self._rotation
+                if isinstance(rotation, tuple):
+                    rotation = Rotation(*rotation)
+                self.wrapped = part.moved(rotation).wrapped
+            finally:
+                self.__dict__["_building"] = None
+
+
+class _BuildLock:
+    # a lock that copies and pickles of a `LazyBin` get anew
+    def __init__(self):
+        self._lock = threading.RLock()
+
+    def __enter__(self) -> bool:
+        return self._lock.acquire()
+
+    def __exit__(self, *exc) -> None:
+        self._lock.release()
+
+    def __reduce__(self):
+        return _BuildLock, ()
+
+
+def _bin(
+    grid: Grid,
+    height: float,
+    compartment: str | Part | None,
+    stacking_lip: str | Part | None,
+    detail: Detail,
+) -> Part:
+    def build() -> Part:
+        base = _bin_base(grid, detail)
+        lip = _bin_lip(grid, stacking_lip, detail)
+        shell = _bin_shell(_bin_body(base, grid, height, detail), lip, height)
+        return _bin_cut(
+            shell,
+            _bin_compartment(grid, height, compartment, detail),
+            lip,
+            height,
+        )
+
+    return stored(
+        "Bin",
+        dict(
+            grid=grid,
+            height=height,
+            compartment=compartment,
+            stacking_lip=stacking_lip,
+            detail=detail,
+        ),
+        build,
+    )
+
+
+# the stages of a bin, `Bin` runs all of them and `ParametricBin` only
+# those whose inputs changed. They may be called within the builder and
+# the locations of the caller, components are created in builders of
+# their own.
+
+
+def _bin_base(grid: Grid, detail: Detail) -> Part:
+    with stage("Bin.base") as s, BuildPart():
+        base = Base(
+            grid=grid, instanced=True, detail=detail, mode=Mode.PRIVATE
+        )
+        s.result(base)
+    return base
+
+
+def _bin_body(base: Part, grid: Grid, height: float, detail: Detail) -> Part:
+    with stage("Bin.body") as s:
+        base_height = base.bounding_box().size.Z
+        wall = _bin_wall(grid, height, base_height, detail)
+        part = Part((base + wall).solids())
+        s.result(part)
+    return part
+
+
+def _bin_wall(
+    grid: Grid, height: float, bottom: float, detail: Detail
+) -> Part:
+    # the body of a bin above its base
+    with BuildPart() as p:
+        with BuildSketch(Plane.XY.offset(bottom)):
+            GridSketch(grid, inset=0.25, detail=detail)
+        extrude(amount=height - bottom)
+    assert p.part is not None
+    return p.part
 
-            # Body
-            with Locations((0, 0, base_height)):
-                extrude(
-                    GridSketch(grid, inset=0.25), amount=height - base_height
-                )
 
-            if compartment is not None:
-                if isinstance(compartment, str):
-                    compartment = Compartment(grid, height - 7)
-                with Locations((0, 0, height)):
-                    add(compartment, mode=Mode.SUBTRACT)
+def _bin_lip(
+    grid: Grid, stacking_lip: str | Part | None, detail: Detail
+) -> Part | None:
+    if isinstance(stacking_lip, str):
+        with BuildPart():
+            return StackingLip(grid=grid, with_support=True, detail=detail)
+    return stacking_lip
 
-            if stacking_lip is not None:
-                if isinstance(stacking_lip, str):
-                    stacking_lip = StackingLip(grid=grid, with_support=True)
-                with Locations((0, 0, height)):
-                    add(stacking_lip)
 
-        assert p.part is not None
-        super().__init__(part=p.part, **kwargs)
+def _bin_compartment(
+    grid: Grid, height: float, compartment: str | Part | None, detail: Detail
+) -> Part | None:
+    if isinstance(compartment, str):
+        with BuildPart():
+            return Compartment(grid, height - 7, detail=detail)
+    return compartment
+
+
+def _bin_shell(body: Part, lip: Part | None, height: float) -> Part:
+    # the lip is added before the compartment is cut, fusing it to the
+    # detailed top of a cut bin is much slower
+    if lip is None:
+        return body
+    with stage("Bin.stacking_lip") as s:
+        part = Part((body + _placed(lip, height)).solids())
+        s.result(part)
+    return part
+
+
+def _bin_cut(
+    shell: Part, compartment: Part | None, lip: Part | None, height: float
+) -> Part:
+    if compartment is None:
+        return shell
+    with stage("Bin.compartment") as s:
+        # the compartment must spare the lip added before
+        if lip is not None:
+            compartment = compartment - lip
+        part = Part((shell - _placed(compartment, height)).solids())
+        s.result(part)
+    return part
+
+
+def _placed(part: Part, z: float) -> Part:
+    # moved without copying the part
+    return Part(part.wrapped.Moved(Location((0, 0, z)).wrapped))
 
 
 class Base(BasePartObject):
-    def __init__(self, grid: Grid, **kwargs):
-        d = [2.15, 1.8, 0.8]
-        with BuildPart() as base:
-            with BuildSketch(Plane.XY.offset(sum(d))):
-                r = Rectangle(42 - 0.5, 42 - 0.5)
-                fillet(r.vertices(), radius=3.75)
+    def __init__(
+        self,
+        grid: GridLike,
+        instanced=False,
+        detail: Detail = "print",
+        **kwargs,
+    ):
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
 
-            extrude(amount=-d[0], taper=45)
-            extrude(faces_xy(base)[0], amount=d[1])
-            extrude(faces_xy(base)[0], amount=d[2], taper=45)
+        def build() -> Part:
+            if detail == "preview":
+                # a single prism instead of the tapered cells
+                with BuildPart() as p:
+                    with BuildSketch():
+                        GridSketch(grid, inset=0.25, detail=detail)
+                    extrude(amount=sum(_BASE_PROFILE))
+                assert p.part is not None
+                return p.part
 
-        with BuildPart() as p:
-            with IrregularGridLocations(42, 42, grid):
-                add(base)
+            cell = cached(("Base", "cell"), _base_cell)
 
-        assert p.part is not None
-        super().__init__(part=p.part, **kwargs)
+            if instanced:
+                # all cells share the TShape of a single cell and only
+                # differ in their location, no boolean operation is done
+                locations = IrregularGridLocations(42, 42, grid).locations
+                return Part(
+                    [
+                        Solid(cell.wrapped.Moved(loc.wrapped))
+                        for loc in locations
+                    ]
+                )
+
+            with BuildPart() as p, stage("Base.fuse", p):
+                with IrregularGridLocations(42, 42, grid):
+                    add(cell)
+
+            assert p.part is not None
+            return p.part
+
+        part = stored(
+            "Base",
+            dict(grid=grid, instanced=instanced, detail=detail),
+            build,
+        )
+        super().__init__(part=part, **kwargs)
+
+
+_BASE_PROFILE = (2.15, 1.8, 0.8)
+
+
+def _base_cell() -> Solid:
+    d = _BASE_PROFILE
+    with BuildPart() as base:
+        with BuildSketch(Plane.XY.offset(sum(d))):
+            r = Rectangle(42 - 0.5, 42 - 0.5)
+            fillet(r.vertices(), radius=3.75)
+
+        extrude(amount=-d[0], taper=45)
+        extrude(faces_xy(base)[0], amount=d[1])
+        extrude(faces_xy(base)[0], amount=d[2], taper=45)
+
+    return base.solids()[0]
 
 
 class Compartment(BasePartObject):
     def __init__(
         self,
-        grid: Grid,
+        grid: GridLike,
         height: float,
         wall_thickness=1.0,
+        detail: Detail = "print",
         mode=Mode.PRIVATE,
         **kwargs,
     ):
-        grid_sketch = GridSketch(grid, inset=0.25 + wall_thickness)
-        with BuildPart() as p:
-            extrude(grid_sketch, amount=-height)
-            fillet(faces_xy(p)[0].edges(), radius=1)
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
+
+        def build() -> Part:
+            grid_sketch = GridSketch(
+                grid, inset=0.25 + wall_thickness, detail=detail
+            )
+            with BuildPart() as p:
+                with stage("Compartment.extrude", p):
+                    extrude(grid_sketch, amount=-height)
+                if detail == "print":
+                    with stage("Compartment.fillet", p):
+                        # the floors of all parts of grids with islands
+                        floors = faces_xy(p).group_by(Axis.Z)[0]
+                        fillet(floors.edges(), radius=1)
 
-        assert p.part is not None
-        super().__init__(part=p.part, mode=mode, **kwargs)
+            assert p.part is not None
+            return p.part
+
+        part = stored(
+            "Compartment",
+            dict(
+                grid=grid,
+                height=height,
+                wall_thickness=wall_thickness,
+                detail=detail,
+            ),
+            build,
+        )
+        super().__init__(part=part, mode=mode, **kwargs)
 
 
 class StackingLip(BasePartObject):
     def __init__(
-        self, grid: Grid, with_support=False, mode=Mode.PRIVATE, **kwargs
+        self,
+        grid: GridLike,
+        with_support=False,
+        detail: Detail = "print",
+        mode=Mode.PRIVATE,
+        **kwargs,
     ):
-        grid_sketch = GridSketch(grid, inset=0.25)
-        d0, d1, d2 = 1.9, 1.8, 0.7  # lip dimensions
-        d3, d4 = 1.2, d0 + d2  # support dimension
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
+        d0, d1, d2 = _LIP_PROFILE
+        d3, d4 = _LIP_SUPPORT, d0 + d2
+
+        def build() -> Part:
+            if detail == "preview":
+                # a straight wall as thick as the lip at its base, the
+                # round of the print lip lowers its sharp top edge
+                bottom = -d3 - d4 if with_support else 0
+                top = (
+                    d0 + d1 + d2 - _LIP_ROUND * (1 / math.tan(math.pi / 8) - 1)
+                )
+                with BuildPart() as p:
+                    with BuildSketch(Plane.XY.offset(bottom)):
+                        GridSketch(grid, inset=0.25, detail=detail)
+                        GridSketch(
+                            grid,
+                            inset=0.25 + d4,
+                            detail=detail,
+                            mode=Mode.SUBTRACT,
+                        )
+                    extrude(amount=top - bottom)
+                assert p.part is not None
+                return p.part
+
+            def section() -> Face:
+                # cross-section of the lip including its top round, x
+                # points from the outer wall towards the cells
+                top = d0 + d1 + d2
+                points = [(0, top), (d0, top - d0), (d0, d2), (d4, 0)]
+                if with_support:
+                    points += [(d4, -d3), (0, -d3 - d4)]
+                else:
+                    points.append((0, 0))
+                with BuildSketch() as s:
+                    Polygon(*points, align=None)
+                    fillet(
+                        s.vertices().group_by(Axis.Y)[-1], radius=_LIP_ROUND
+                    )
+                return s.sketch.face()
+
+            with stage("StackingLip.profile"):
+                profile = cached(
+                    ("StackingLip", "section", with_support), section
+                )
+
+            # every outline and hole is swept in a single operation, the
+            # outlines are tangent continuous and the cells are on their
+            # left hand side
+            solids = []
+            with stage("StackingLip.sweep") as s:
+                for outline, holes in regions(grid):
+                    for loop in [outline, *holes]:
+                        path = _wire(grid, loop, 0.25, 4 - 0.25)
+                        origin, t = path.position_at(0), path.tangent_at(0)
+                        x_dir = Vector(-t.Y, t.X)
+                        plane = Plane(
+                            origin,
+                            x_dir=x_dir,
+                            z_dir=x_dir.cross(Vector(0, 0, 1)),
+                        )
+                        solids.append(Solid.sweep(plane * profile, path))
+                part = Part(solids)
+                s.result(part)
+            return part
 
-        with BuildPart() as n:
-            extrude(grid_sketch, amount=-d0, taper=45)
-            extrude(faces_xy(n)[0], amount=d1)
-            extrude(faces_xy(n)[0], amount=d2, taper=45)
-            extrude(faces_xy(n)[0], amount=d3)
-            extrude(faces_xy(n)[0], amount=d4, taper=-45)
+        part = stored(
+            "StackingLip",
+            dict(grid=grid, with_support=with_support, detail=detail),
+            build,
+        )
+        super().__init__(part=part, mode=mode, **kwargs)
 
-        with BuildPart() as p:
-            extrude(grid_sketch, amount=d0 + d1 + d2)
-            if with_support:
-                extrude(grid_sketch, amount=-d3 - d4)
-            with Locations((0, 0, d0 + d1 + d2)):
-                add(n, mode=Mode.SUBTRACT)
-            fillet(p.edges().group_by(Axis.Z)[-1], radius=0.6)
 
-        assert type(p.part) is Part
-        super().__init__(part=p.part, mode=mode, **kwargs)
+_LIP_PROFILE = (1.9, 1.8, 0.7)  # lip dimensions
+_LIP_SUPPORT = 1.2  # support dimension
+_LIP_ROUND = 0.6  # radius of the top round
 
 
 class GridSketch(BaseSketchObject):
     def __init__(
-        self, grid: Grid, inset: float = 0, with_fillet=True, **kwargs
+        self,
+        grid: GridLike,
+        inset: float = 0,
+        with_fillet=True,
+        detail: Detail = "print",
+        **kwargs,
     ):
-        with BuildSketch(Plane.XY) as s:
-            with IrregularGridLocations(42, 42, grid):
-                Rectangle(42, 42)
-            offset(amount=-inset, kind=Kind.INTERSECTION)
-            if with_fillet:
-                fillet(s.vertices(), radius=4 - inset)
-
-        # the fillet operation above always creates a face with a
-        # single Wire even when holes are present, let's fix that:
-        wires = Wire.combine(s.edges())
-        f = Face(outer_wire=wires[0], inner_wires=wires[1:])
-
-        super().__init__(f, **kwargs)
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
+        with_fillet = with_fillet and detail == "print"
+        radius = 4 - inset if with_fillet else 0
+
+        def face() -> Face | Compound:
+            # the outlines are traced from the grid and inset and rounded
+            # analytically, no boolean operations are required
+            faces = []
+            for outline, holes in regions(grid):
+                wires = [
+                    _wire(grid, loop, inset, radius)
+                    for loop in [outline, *holes]
+                ]
+                faces.append(Face(wires[0], wires[1:]))
+            return faces[0] if len(faces) == 1 else Compound(faces)
+
+        with stage("GridSketch") as s:
+            f = cached(("GridSketch", grid, inset, with_fillet), face)
+            s.result(f)
+
+        # the cached face is shared, hand over a copy that may be moved
+        super().__init__(copy.copy(f), **kwargs)
+
+
+def _wire(grid: Grid, loop: Loop, inset: float, radius: float) -> Wire:
+    points = [Vector(*point) for point, _, _, _ in corners(grid, loop, inset)]
+    return _rounded_wire(points, radius)
+
+
+def _rounded_wire(points: list[Vector], radius: float) -> Wire:
+    # closed polygon with all of its right-angled corners rounded
+    corners = []
+    for k, c in enumerate(points):
+        a = (c - points[k - 1]).normalized()
+        b = (points[(k + 1) % len(points)] - c).normalized()
+        if a.cross(b).length > 1e-9:
+            corners.append((c, a, b))
+
+    edges: list[Edge] = []
+    ends: list[tuple[Vector, Vector]] = []
+    for c, a, b in corners:
+        if radius > 0:
+            start, end = c - a * radius, c + b * radius
+            center = c + (b - a) * radius
+            mid = center + (a - b).normalized() * radius
+            edges.append(Edge.make_three_point_arc(start, mid, end))
+            ends.append((start, end))
+        else:
+            ends.append((c, c))
+    for k in range(len(ends)):
+        start, end = ends[k - 1][1], ends[k][0]
+        if (end - start).length > 1e-9:
+            edges.append(Edge.make_line(start, end))
+    return Wire(edges)
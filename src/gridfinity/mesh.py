@@ -0,0 +1,328 @@
+"""Triangle meshes of standard bins built without OCCT.
+
+    mesh = gf.mesh.bin_mesh(grid=[[True] * 3] * 2, height=21)
+    mesh.vertices, mesh.faces  # (n, 3) float and (m, 3) int arrays
+
+Bins with a rectangular grid, the default compartment or none and the
+default stacking lip or none are generated directly from the profiles of
+their components. The walls, the lip and the compartment are a single
+profile swept along the outline, the base is a stack of rounded squares
+per cell. The meshes are closed, their faces are those of `Bin` with
+every rounded corner split into `segments` pieces. Irregular grids and
+other compartments such as `extra.SubdividedCompartment` are not
+supported and raise a `ValueError`, they have to be built with `Bin` and
+meshed with `export.tessellate`.
+"""
+
+import dataclasses
+import math
+
+import numpy as np
+
+from .estimate import (
+    _COMPARTMENT_FILLET,
+    _COMPARTMENT_FLOOR,
+    _INSET,
+    _LIP_TOP,
+    _RADIUS,
+    _SPACING,
+)
+from .main import _BASE_PROFILE, _LIP_PROFILE, _LIP_ROUND, _LIP_SUPPORT
+from .types import Detail, Grid, GridLike, check_detail
+
+_WALL = 1.0  # wall thickness of the default compartment
+
+
+@dataclasses.dataclass(frozen=True)
+class Mesh:
+    vertices: np.ndarray  # (n, 3) float
+    faces: np.ndarray  # (m, 3) int, counter-clockwise seen from outside
+
+    @property
+    def volume(self) -> float:
+        a, b, c = (self.vertices[self.faces[:, k]] for k in range(3))
+        return float(np.einsum("ij,ij->i", a, np.cross(b, c)).sum() / 6)
+
+
+def bin_mesh(
+    grid: GridLike,
+    height: float,
+    compartment: bool = True,
+    stacking_lip: bool = True,
+    detail: Detail = "print",
+    segments: int = 8,
+) -> Mesh:
+    """Mesh a bin with a rectangular grid and the default components.
+
+    `compartment` and `stacking_lip` tell whether the bin has the default
+    compartment and stacking lip, see `Bin`.
+    """
+    grid = Grid(grid)
+    check_detail(detail)
+    n_cols, n_rows = grid.size
+    if not grid.indices or grid.count != n_cols * n_rows:
+        raise ValueError(
+            "Meshes are only generated for rectangular grids, use "
+            "export.tessellate(Bin(...)) for other grids"
+        )
+    for name, value in [
+        ("compartment", compartment),
+        ("stacking_lip", stacking_lip),
+    ]:
+        if not isinstance(value, bool):
+            raise ValueError(
+                f"Meshes are only generated for the default {name} or "
+                f"none, use export.tessellate(Bin(...)) for others"
+            )
+    if segments < 1:
+        raise ValueError(f"Invalid segments: {segments}")
+    rounded = detail == "print"
+
+    profile = _profile(height, compartment, stacking_lip, rounded, segments)
+    path, normals = _outline(n_cols, n_rows, rounded, segments)
+    parts = [_sweep(path, normals, profile)]
+    # the floor of the compartment or the top of the bin
+    x, z = profile[-1]
+    parts.append(_fan(path + x * normals, z, up=True))
+    if rounded:
+        parts += _base(n_cols, n_rows, segments)
+    else:
+        parts.append(_fan(path, 0, up=False))
+    return _weld(np.concatenate(parts))
+
+
+def _profile(
+    height: float,
+    compartment: bool,
+    stacking_lip: bool,
+    rounded: bool,
+    segments: int,
+) -> np.ndarray:
+    # the section of the walls from the outside of the bin to the floor
+    # of the compartment, x points from the outline towards the cells
+    d0, d1, d2 = _LIP_PROFILE
+    d3, d4 = _LIP_SUPPORT, d0 + d2
+    points = [(0.0, sum(_BASE_PROFILE) if rounded else 0.0)]
+    if stacking_lip and rounded:
+        r = _LIP_ROUND
+        z = height + _LIP_TOP - r
+        points += _arc((r, z), r, math.pi, math.pi / 4, segments)
+        points += [(d0, height + d1 + d2), (d0, height + d2), (d4, height)]
+    elif stacking_lip:
+        top = height + _LIP_TOP
+        points += [(0, top), (d4, top), (d4, height)]
+    else:
+        points.append((0, height))
+
+    if not compartment:
+        return np.array(points)
+    # the compartment spares the support of the lip
+    if stacking_lip and rounded:
+        points += [(d4, height - d3), (_WALL, height - d3 - d4 + _WALL)]
+    elif stacking_lip:
+        points += [(d4, height - d3 - d4), (_WALL, height - d3 - d4)]
+    else:
+        points.append((_WALL, height))
+    r = _COMPARTMENT_FILLET if rounded else 0
+    if points[-1][1] < _COMPARTMENT_FLOOR + r:
+        raise ValueError(f"Bin is too low to be meshed: {height}")
+    center = (_WALL + r, _COMPARTMENT_FLOOR + r)
+    if rounded:
+        points += _arc(center, r, math.pi, 3 * math.pi / 2, segments)
+    else:
+        points.append(center)
+    return np.array(points)
+
+
+def _arc(
+    center: tuple[float, float],
+    radius: float,
+    start: float,
+    end: float,
+    segments: int,
+) -> list[tuple[float, float]]:
+    # `segments` pieces per quarter circle
+    n = max(1, math.ceil(segments * abs(end - start) / (math.pi / 2) - 1e-9))
+    return [
+        (center[0] + radius * math.cos(a), center[1] + radius * math.sin(a))
+        for a in np.linspace(start, end, n + 1)
+    ]
+
+
+def _rounded_rect(
+    center: tuple[float, float],
+    half: tuple[float, float],
+    radius: float,
+    segments: int,
+    xs: list[float] | None = None,
+    ys: list[float] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    # counter-clockwise points of a rounded rectangle starting with the
+    # arc of the bottom right corner, the corners have `segments + 1`
+    # points each, `xs` and `ys` are additional points on the sides.
+    # Returns the points and their unit normals pointing inwards
+    cx, cy = center
+    hx, hy = half[0] - radius, half[1] - radius
+    t = np.linspace(0, math.pi / 2, segments + 1)
+    points, normals = [], []
+    for k, (sx, sy) in enumerate([(1, -1), (1, 1), (-1, 1), (-1, -1)]):
+        a = t + (k - 1) * math.pi / 2
+        d = np.stack([np.cos(a), np.sin(a)], axis=1)
+        points.append(np.array([cx + sx * hx, cy + sy * hy]) + radius * d)
+        normals.append(-d)
+        # the side after the corner
+        n = np.array([[-1, 0], [0, -1], [1, 0], [0, 1]][k], dtype=float)
+        if k % 2 == 0:
+            side = sorted(ys or [], reverse=k == 2)
+            p = [(cx - n[0] * half[0], y) for y in side]
+        else:
+            side = sorted(xs or [], reverse=k == 1)
+            p = [(x, cy - n[1] * half[1]) for x in side]
+        points.append(np.array(p).reshape(-1, 2))
+        normals.append(np.tile(n, (len(p), 1)))
+    return np.concatenate(points), np.concatenate(normals)
+
+
+def _outline(
+    n_cols: int, n_rows: int, rounded: bool, segments: int
+) -> tuple[np.ndarray, np.ndarray]:
+    half = (_SPACING * n_cols / 2 - _INSET, _SPACING * n_rows / 2 - _INSET)
+    if not rounded:
+        # the normals of sharp corners are scaled to move both sides
+        points = np.array([(1, -1), (1, 1), (-1, 1), (-1, -1)]) * half
+        return points, -np.sign(points)
+    # the points where the cells of the base meet the outline
+    r = _RADIUS - _INSET
+
+    def breaks(n: int) -> list[float]:
+        lines = [_SPACING * (k - n / 2) for k in range(1, n)]
+        return [x + d for x in lines for d in (-_RADIUS, 0, _RADIUS)]
+
+    return _rounded_rect(
+        (0, 0), half, r, segments, breaks(n_cols), breaks(n_rows)
+    )
+
+
+def _sweep(
+    path: np.ndarray, normals: np.ndarray, profile: np.ndarray
+) -> np.ndarray:
+    # the rings of the profile along the closed path
+    xy = path[None] + profile[:, 0, None, None] * normals[None]
+    z = np.broadcast_to(profile[:, 1, None, None], xy.shape[:2] + (1,))
+    rings = np.concatenate([xy, z], axis=2)
+    a, d = rings[:-1], rings[1:]
+    b, c = np.roll(a, -1, axis=1), np.roll(d, -1, axis=1)
+    triangles = np.concatenate(
+        [np.stack([a, b, c], axis=2), np.stack([a, c, d], axis=2)]
+    )
+    return triangles.reshape(-1, 3, 3)
+
+
+def _fan(ring: np.ndarray, z: float, up: bool) -> np.ndarray:
+    # a convex ring filled from its center
+    points = np.concatenate([ring, np.full((len(ring), 1), z)], axis=1)
+    center = np.broadcast_to([*ring.mean(axis=0), z], points.shape)
+    triangles = np.stack([center, points, np.roll(points, -1, axis=0)], 1)
+    return _oriented(triangles, up)
+
+
+def _oriented(triangles: np.ndarray, up: bool) -> np.ndarray:
+    # horizontal triangles facing up or down
+    u = triangles[:, 1, :2] - triangles[:, 0, :2]
+    v = triangles[:, 2, :2] - triangles[:, 0, :2]
+    flip = (u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0] > 0) != up
+    triangles[flip] = triangles[flip][:, ::-1]
+    return triangles
+
+
+def _base(n_cols: int, n_rows: int, segments: int) -> list[np.ndarray]:
+    d0, d1, d2 = _BASE_PROFILE
+    size = _SPACING / 2 - _INSET
+    radius = _RADIUS - _INSET
+    centers = [
+        (_SPACING * (j - (n_cols - 1) / 2), _SPACING * (k - (n_rows - 1) / 2))
+        for j in range(n_cols)
+        for k in range(n_rows)
+    ]
+    # the levels of a cell from its bottom to its top
+    levels = [(d0 + d2, 0), (d0, d2), (d0, d2 + d1), (0, d0 + d1 + d2)]
+    rings = []
+    for inset, z in levels:
+        points, _ = _rounded_rect(
+            (0, 0), (size - inset, size - inset), radius - inset, segments
+        )
+        rings.append(np.concatenate([points, np.full((len(points), 1), z)], 1))
+    cell = np.concatenate(
+        [_sweep_rings(rings[k], rings[k + 1]) for k in range(3)]
+        + [_fan(rings[0][:, :2], 0, up=False)]
+    )
+    offsets = np.array([(x, y, 0) for x, y in centers])
+    parts = [(cell[None] + offsets[:, None, None]).reshape(-1, 3, 3)]
+    if len(centers) > 1:
+        parts.append(_gaps(n_cols, n_rows, rings[-1], segments))
+    return parts
+
+
+def _sweep_rings(lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+    a, d = lower, upper
+    b, c = np.roll(a, -1, axis=0), np.roll(d, -1, axis=0)
+    return np.concatenate([np.stack([a, b, c], 1), np.stack([a, c, d], 1)])
+
+
+def _gaps(
+    n_cols: int, n_rows: int, top: np.ndarray, segments: int
+) -> np.ndarray:
+    # the bottom of the body between the tops of the cells, each cell
+    # fills the part of its square of the grid around its top
+    half = _SPACING / 2
+    z = top[0, 2]
+    triangles = []
+    for j in range(n_cols):
+        for k in range(n_rows):
+            cx = _SPACING * (j - (n_cols - 1) / 2)
+            cy = _SPACING * (k - (n_rows - 1) / 2)
+            ring = top + (cx, cy, 0)
+            # the square of the cell ends at the outline of the bin
+            x0 = cx - half + (_INSET if j == 0 else 0)
+            x1 = cx + half - (_INSET if j == n_cols - 1 else 0)
+            y0 = cy - half + (_INSET if k == 0 else 0)
+            y1 = cy + half - (_INSET if k == n_rows - 1 else 0)
+            on_outline = [j == n_cols - 1, k == n_rows - 1, j == 0, k == 0]
+            corners = [(x1, y0), (x1, y1), (x0, y1), (x0, y0)]
+            n = segments + 1
+            for c in range(4):
+                before, after = on_outline[c - 1], on_outline[c]
+                p = (*corners[c], z)
+                if not (before and after):
+                    # the corners of the outline are the ones of the cell
+                    arc = ring[c * n : (c + 1) * n]
+                    triangles += [
+                        (arc[i], arc[i + 1], p) for i in range(n - 1)
+                    ]
+                if not after:
+                    a, b = ring[c * n + n - 1], ring[(c + 1) % 4 * n]
+                    q = (*corners[(c + 1) % 4], z)
+                    triangles += [(a, b, q), (a, q, p)]
+    return _oriented(np.array(triangles, dtype=float), up=False)
+
+
+def _weld(triangles: np.ndarray) -> Mesh:
+    # equal points become one vertex, collapsed triangles are dropped
+    points = triangles.reshape(-1, 3)
+    # sorting integer columns is much faster than `np.unique(axis=0)`
+    keys = np.round(points * 1e6).astype(np.int64)
+    order = np.lexsort(keys.T[::-1])
+    keys = keys[order]
+    first = np.empty(len(keys), dtype=bool)
+    first[0] = True
+    first[1:] = (keys[1:] != keys[:-1]).any(axis=1)
+    inverse = np.empty(len(keys), dtype=np.int64)
+    inverse[order] = np.cumsum(first) - 1
+    vertices = points[order[first]]
+    faces = inverse.reshape(-1, 3)
+    keep = (
+        (faces[:, 0] != faces[:, 1])
+        & (faces[:, 1] != faces[:, 2])
+        & (faces[:, 0] != faces[:, 2])
+    )
+    return Mesh(vertices, faces[keep])
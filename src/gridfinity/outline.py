@@ -0,0 +1,140 @@
+from .types import Grid, GridLike
+
+Vertex = tuple[int, int]
+Loop = list[Vertex]
+Point = tuple[float, float]
+Corner = tuple[Point, Point, Point, bool]
+
+
+def trace(grid: GridLike) -> list[Loop]:
+    """Trace the boundary loops of the cells of a grid.
+
+    Vertices are the corners of the loops on the cell lattice, i.e. the
+    column and the row counted from the front. The cells are always on the
+    left hand side, so outlines run counter-clockwise and holes clockwise.
+    Cells that only touch at a corner are kept apart.
+    """
+    grid = Grid(grid)
+    cells = {(j, grid.n_rows - 1 - i) for i, j in grid.indices}
+
+    edges: dict[Vertex, list[Vertex]] = {}
+    for x, y in cells:
+        if (x, y - 1) not in cells:
+            edges.setdefault((x, y), []).append((x + 1, y))
+        if (x + 1, y) not in cells:
+            edges.setdefault((x + 1, y), []).append((x + 1, y + 1))
+        if (x, y + 1) not in cells:
+            edges.setdefault((x + 1, y + 1), []).append((x, y + 1))
+        if (x - 1, y) not in cells:
+            edges.setdefault((x, y + 1), []).append((x, y))
+
+    loops: list[Loop] = []
+    while edges:
+        # the lowest vertex is never one where two loops touch
+        start = min(edges, key=lambda v: (v[1], v[0]))
+        path = [start]
+        current = _next(edges, start, None)
+        while current != start:
+            path.append(current)
+            current = _next(edges, current, path[-2])
+        loops.append(_corners(path))
+    return loops
+
+
+def _next(
+    edges: dict[Vertex, list[Vertex]], v: Vertex, prev: Vertex | None
+) -> Vertex:
+    targets = edges[v]
+    if len(targets) > 1 and prev is not None:
+        # where cells touch diagonally turn left to keep them apart
+        d_in = (v[0] - prev[0], v[1] - prev[1])
+        target = next(
+            t for t in targets if _cross(d_in, (t[0] - v[0], t[1] - v[1])) > 0
+        )
+        targets.remove(target)
+    else:
+        target = targets.pop()
+    if not targets:
+        del edges[v]
+    return target
+
+
+def _corners(path: Loop) -> Loop:
+    n = len(path)
+    return [
+        v
+        for k, v in enumerate(path)
+        if _cross(_direction(path[k - 1], v), _direction(v, path[(k + 1) % n]))
+    ]
+
+
+def _direction(a: tuple[float, float], b: tuple[float, float]) -> Point:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    length = (dx * dx + dy * dy) ** 0.5
+    return dx / length, dy / length
+
+
+def _cross(a: tuple[float, float], b: tuple[float, float]) -> float:
+    return a[0] * b[1] - a[1] * b[0]
+
+
+def area(loop: Loop) -> float:
+    """Signed area of a loop in cells, negative for holes."""
+    return (
+        sum(
+            _cross(loop[k - 1], loop[k])  # shoelace formula
+            for k in range(len(loop))
+        )
+        / 2
+    )
+
+
+def regions(grid: GridLike) -> list[tuple[Loop, list[Loop]]]:
+    """Group the loops of a grid into outlines and the holes within them."""
+    loops = trace(grid)
+    outlines = sorted((lp for lp in loops if area(lp) > 0), key=area)
+    result: list[tuple[Loop, list[Loop]]] = [(lp, []) for lp in outlines]
+    for hole in (lp for lp in loops if area(lp) < 0):
+        # a point just right of the first edge lies inside the hole
+        (ax, ay), (bx, by) = hole[0], hole[1]
+        dx, dy = _direction(hole[0], hole[1])
+        p = ((ax + bx) / 2 + dy / 4, (ay + by) / 2 - dx / 4)
+        _, holes = next(r for r in result if _contains(r[0], p))
+        holes.append(hole)
+    return result
+
+
+def _contains(loop: Loop, p: Point) -> bool:
+    inside = False
+    for k in range(len(loop)):
+        (ax, ay), (bx, by) = loop[k - 1], loop[k]
+        if (ay > p[1]) != (by > p[1]):
+            if p[0] < ax + (p[1] - ay) * (bx - ax) / (by - ay):
+                inside = not inside
+    return inside
+
+
+def corners(
+    grid: GridLike, loop: Loop, inset: float = 0, spacing: float = 42
+) -> list[Corner]:
+    """Corners of a loop placed like the cells of `IrregularGridLocations`.
+
+    Each corner is given as the point moved by `inset` towards the cells,
+    the unit directions of the edges before and after it and whether it
+    is convex.
+    """
+    grid = Grid(grid)
+    x0 = -spacing * grid.n_cols / 2
+    y0 = -spacing * grid.n_rows / 2
+    n = len(loop)
+    result: list[Corner] = []
+    for k, (x, y) in enumerate(loop):
+        a = _direction(loop[k - 1], loop[k])
+        b = _direction(loop[k], loop[(k + 1) % n])
+        # moving along the left normals of both edges
+        point = (
+            x0 + spacing * x - inset * (a[1] + b[1]),
+            y0 + spacing * y + inset * (a[0] + b[0]),
+        )
+        result.append((point, a, b, _cross(a, b) > 0))
+    return result
@@ -0,0 +1,159 @@
+"""Bins that only rebuild what changed.
+
+    b = ParametricBin(grid=[[True] * 2] * 2, height=21)
+    export_stl(b.part, "bin_21.stl")
+    b.height = 28  # the base and the stacking lip are reused
+    export_stl(b.part, "bin_28.stl")
+
+The stages of a bin are nodes of a small dependency graph. Changing a
+parameter drops the results of the stages that depend on it, they are
+built again the next time the part is requested.
+"""
+
+import typing
+from collections.abc import Callable
+from typing import Any
+
+from build123d import Part
+
+from .cache import stored
+from .main import (
+    _bin_base,
+    _bin_body,
+    _bin_compartment,
+    _bin_cut,
+    _bin_lip,
+    _bin_shell,
+)
+from .types import Detail, Grid, GridLike, check_detail
+
+# stage name -> (inputs, build function)
+_STAGES: dict[str, tuple[tuple[str, ...], Callable[..., Any]]] = {
+    "base": (("grid", "detail"), _bin_base),
+    "body": (("base", "grid", "height", "detail"), _bin_body),
+    "lip": (("grid", "stacking_lip", "detail"), _bin_lip),
+    "shell": (("body", "lip", "height"), _bin_shell),
+    "cavity": (
+        ("grid", "height", "compartment", "detail"),
+        _bin_compartment,
+    ),
+    "part": (("shell", "cavity", "lip", "height"), _bin_cut),
+}
+
+
+class _Graph:
+    """Results of build functions that are kept until their inputs change.
+
+    `stages` maps the name of each stage to the names of its inputs and
+    the function building it. Inputs are parameters or other stages.
+    """
+
+    def __init__(
+        self,
+        stages: dict[str, tuple[tuple[str, ...], Callable[..., Any]]],
+        params: dict[str, Any],
+    ):
+        assert not stages.keys() & params.keys()
+        self.stages = stages
+        self.params = dict(params)
+        self.results: dict[str, Any] = {}
+
+    def get(self, name: str) -> Any:
+        if name in self.params:
+            return self.params[name]
+        if name not in self.results:
+            inputs, build = self.stages[name]
+            self.results[name] = build(*(self.get(i) for i in inputs))
+        return self.results[name]
+
+    def set(self, **changes: Any) -> None:
+        for name, value in changes.items():
+            if name not in self.params:
+                raise TypeError(f"Unknown parameter: '{name}'")
+            if _same(self.params[name], value):
+                continue
+            self.params[name] = value
+            self._invalidate(name)
+
+    def outdated(self) -> list[str]:
+        """Stages that are built again on the next request."""
+        return [name for name in self.stages if name not in self.results]
+
+    def _invalidate(self, name: str) -> None:
+        for stage, (inputs, _) in self.stages.items():
+            if name in inputs and stage in self.results:
+                del self.results[stage]
+                self._invalidate(stage)
+
+
+def _same(a: Any, b: Any) -> bool:
+    # shapes are only the same if they are the same object
+    if a is b:
+        return True
+    if isinstance(a, Part) or isinstance(b, Part):
+        return False
+    return bool(a == b)
+
+
+class ParametricBin:
+    """A `Bin` whose parameters can be changed after it was built.
+
+    Only the stages depending on a changed parameter are built again, the
+    base and the stacking lip of a bin with a new height are reused.
+    """
+
+    _PARAMS = ("grid", "height", "compartment", "stacking_lip", "detail")
+
+    def __init__(
+        self,
+        grid: GridLike,
+        height: float,
+        compartment: (typing.Literal["default"] | Part | None) = "default",
+        stacking_lip: (typing.Literal["default"] | Part | None) = "default",
+        detail: Detail = "print",
+    ):
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
+        object.__setattr__(
+            self,
+            "graph",
+            _Graph(
+                _STAGES,
+                dict(
+                    grid=grid,
+                    height=height,
+                    compartment=compartment,
+                    stacking_lip=stacking_lip,
+                    detail=detail,
+                ),
+            ),
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self._PARAMS:
+            return self.graph.params[name]
+        raise AttributeError(name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in self._PARAMS:
+            self.set(**{name: value})
+        else:
+            object.__setattr__(self, name, value)
+
+    def set(self, **changes: Any) -> None:
+        """Change several parameters at once."""
+        if "grid" in changes:
+            changes["grid"] = Grid(changes["grid"])
+            if not changes["grid"].indices:
+                raise ValueError("Grid does not contain any cells")
+        if "detail" in changes:
+            check_detail(changes["detail"])
+        self.graph.set(**changes)
+
+    @property
+    def part(self) -> Part:
+        """The bin for the current parameters."""
+        params = self.graph.params
+        return stored("Bin", params, lambda: self.graph.get("part"))
@@ -0,0 +1,228 @@
+"""Opt-in instrumentation of the build stages of the components.
+
+    with gf.profiling.Profiler() as profiler:
+        gf.Bin(grid=[[True]], height=21)
+    profiler.write_chrome_trace("trace.json")
+
+Every stage records its wall time, the OCCT operations it ran and the
+number of faces and edges before and after it. Without an active
+`Profiler` a stage does nothing.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any
+
+from build123d import Builder, Face, Shape, Solid, Wire
+from build123d.topology import Mixin3D
+
+from . import booleans
+
+_profiler: ContextVar["Profiler | None"] = ContextVar(
+    "gridfinity.profiling.profiler", default=None
+)
+_stages: ContextVar[tuple["_Stage", ...]] = ContextVar(
+    "gridfinity.profiling.stages", default=()
+)
+
+
+def _topology(shape: Shape | None) -> dict[str, int] | None:
+    if shape is None:
+        return None
+    return {"faces": len(shape.faces()), "edges": len(shape.edges())}
+
+
+class _Stage:
+    def __init__(
+        self, profiler: "Profiler", name: str, builder: Builder | None
+    ):
+        self.profiler = profiler
+        self.name = name
+        self.builder = builder
+        self.ops: Counter[str] = Counter()
+        self.args: dict[str, Any] = {}
+        self.input: dict[str, int] | None = None
+        self.output: dict[str, int] | None = None
+
+    def __enter__(self) -> "_Stage":
+        if self.builder is not None:
+            self.input = _topology(self.builder._obj)
+        self._token = _stages.set((*_stages.get(), self))
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        end = time.perf_counter_ns()
+        _stages.reset(self._token)
+        if self.builder is not None:
+            self.output = _topology(self.builder._obj)
+        self.profiler._record(self, end)
+
+    def result(self, shape: Shape, **args: Any) -> None:
+        """Record the shape created by the stage and further details."""
+        self.output = _topology(shape)
+        self.args.update(args)
+
+
+class _NullStage:
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def result(self, shape: Shape, **args: Any) -> None:
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str, builder: Builder | None = None) -> _Stage | _NullStage:
+    """Context manager marking a named build stage.
+
+    If a `builder` is given the topology of its object is recorded before
+    and after the stage.
+    """
+    profiler = _profiler.get()
+    if profiler is None:
+        return _NULL_STAGE
+    return _Stage(profiler, name, builder)
+
+
+# build123d methods and functions of this package that are counted as
+# OCCT operations
+_OPERATIONS: list[tuple[str, Any, str]] = [
+    ("boolean", Shape, "_bool_op"),
+    ("boolean", booleans, "_run"),
+    ("clean", Shape, "clean"),
+    ("fillet", Mixin3D, "fillet"),
+    ("chamfer", Mixin3D, "chamfer"),
+    ("fillet", Face, "fillet_2d"),
+    ("fillet", Wire, "fillet_2d"),
+    ("extrude", Solid, "extrude"),
+    ("extrude", Solid, "extrude_taper"),
+    ("sweep", Solid, "sweep"),
+    ("loft", Solid, "make_loft"),
+]
+_originals: dict[tuple[Any, str], Any] = {}
+_active = 0
+_lock = threading.Lock()
+
+
+def _counting(kind: str, func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        for s in _stages.get():
+            s.ops[kind] += 1
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def _install() -> None:
+    global _active
+    with _lock:
+        _active += 1
+        if _active > 1:
+            return
+        for kind, cls, name in _OPERATIONS:
+            original = cls.__dict__[name]
+            _originals[(cls, name)] = original
+            if isinstance(original, classmethod):
+                wrapped = classmethod(_counting(kind, original.__func__))
+            else:
+                wrapped = _counting(kind, original)
+            setattr(cls, name, wrapped)
+
+
+def _uninstall() -> None:
+    global _active
+    with _lock:
+        _active -= 1
+        if _active > 0:
+            return
+        for (cls, name), original in _originals.items():
+            setattr(cls, name, original)
+        _originals.clear()
+
+
+class Profiler:
+    """Collect the build stages run within the context.
+
+    `callback` is called with the record of every finished stage.
+    """
+
+    def __init__(self, callback: Callable[[dict], None] | None = None):
+        self.callback = callback
+        self.records: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Profiler":
+        _install()
+        self.origin = time.perf_counter_ns()
+        self._token = _profiler.set(self)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        _profiler.reset(self._token)
+        _uninstall()
+
+    def _record(self, s: _Stage, end: int) -> None:
+        record = {
+            "name": s.name,
+            "start": (s.start - self.origin) / 1e9,
+            "duration": (end - s.start) / 1e9,
+            "depth": len(_stages.get()),
+            "thread": threading.get_ident(),
+            "operations": dict(s.ops),
+            "input": s.input,
+            "output": s.output,
+            **s.args,
+        }
+        with self._lock:
+            self.records.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self) -> dict[str, float]:
+        """Total time spent in each stage by name."""
+        totals: Counter[str] = Counter()
+        for record in self.records:
+            totals[record["name"]] += record["duration"]
+        return dict(totals.most_common())
+
+    def write_json(self, path: str | os.PathLike) -> None:
+        with open(path, "w") as f:
+            json.dump(self.records, f, indent=2)
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """The records in the Chrome trace event format."""
+        events = [
+            {
+                "name": r["name"],
+                "cat": "gridfinity",
+                "ph": "X",
+                "ts": r["start"] * 1e6,
+                "dur": r["duration"] * 1e6,
+                "pid": os.getpid(),
+                "tid": r["thread"],
+                "args": {
+                    k: v
+                    for k, v in r.items()
+                    if k not in ("name", "start", "duration", "thread")
+                },
+            }
+            for r in self.records
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: str | os.PathLike) -> None:
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
@@ -0,0 +1,142 @@
+"""Large bins assembled from prefabricated cells.
+
+    part = gf.TiledBin(grid=[[True] * 12] * 8, height=21)
+
+Every feature of a bin lies within a few millimeters of its outline, so
+the part of a bin above a cell only depends on which of the eight
+neighbors of the cell exist. The cells are classified by their
+neighborhood up to rotation (interior, straight edge, outer corner,
+inner corner, ...). A prefab of each class is cut from a small bin of
+the neighborhood and cached, the bin is made of the prefabs placed at
+their cells and glued together by a single boolean. The roundings of
+concave corners reach into empty squares, which get prefabs as well.
+Rectangular grids need three prefabs and the build time grows linearly
+with the number of cells.
+"""
+
+import typing
+from collections.abc import Iterator
+
+from build123d import BasePartObject, Location, Part, Rotation, Solid
+
+from .booleans import fuse
+from .cache import cached, stored
+from .main import _bin
+from .profiling import stage
+from .types import Detail, Grid, GridLike, check_detail
+
+# the neighbors of a square clockwise from the one behind it as offsets
+# of (row, column), shifting them by two rotates them by 90°. A pattern
+# is whether the square is a cell followed by its neighbors
+_RING = ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1))
+
+Pattern = tuple[bool, ...]
+
+
+class TiledBin(BasePartObject):
+    """A `Bin` with the default components built from cached cells.
+
+    Takes the parameters of `Bin`, the compartment and the stacking lip
+    are either `"default"` or `None`. Worthwhile above about 8x8 cells,
+    the prefabs of smaller bins take longer than the bin itself.
+    """
+
+    def __init__(
+        self,
+        grid: GridLike,
+        height: float,
+        compartment: typing.Literal["default"] | None = "default",
+        stacking_lip: typing.Literal["default"] | None = "default",
+        detail: Detail = "print",
+        **kwargs,
+    ):
+        grid = Grid(grid)
+        check_detail(detail)
+        if not grid.indices:
+            raise ValueError("Grid does not contain any cells")
+        for name, value in [
+            ("compartment", compartment),
+            ("stacking_lip", stacking_lip),
+        ]:
+            if value not in ("default", None):
+                raise ValueError(f"Only the default {name} can be tiled")
+        params = dict(
+            height=height,
+            compartment=compartment,
+            stacking_lip=stacking_lip,
+            detail=detail,
+        )
+
+        def build() -> Part:
+            placed = [
+                (prefab, loc * Rotation(0, 0, -90 * k))
+                for pattern, k, loc in _tiles(grid)
+                if (prefab := _prefab(pattern, **params)) is not None
+            ]
+            (first, loc), *rest = placed
+            with stage("TiledBin.glue") as s:
+                part = fuse(first.moved(loc), rest, glue=True)
+                part = Part(part.solids())
+                s.result(part)
+            return part
+
+        part = stored("TiledBin", dict(grid=grid, **params), build)
+        super().__init__(part=part, **kwargs)
+
+
+def _tiles(grid: Grid) -> Iterator[tuple[Pattern, int, Location]]:
+    # the class of each square of the grid holding a part of the bin, the
+    # quarter turns from its class and its location. Besides the cells
+    # the roundings of concave corners reach into empty squares
+    for i in range(grid.n_rows):
+        for j in range(grid.n_cols):
+            ring = tuple((i + di, j + dj) in grid for di, dj in _RING)
+            occupied = (i, j) in grid
+            if not occupied and not any(
+                ring[k] and ring[(k + 2) % 8] for k in (0, 2, 4, 6)
+            ):
+                continue
+            turns = [ring[2 * k :] + ring[: 2 * k] for k in range(4)]
+            k = min(range(4), key=turns.__getitem__)
+            yield (occupied, *turns[k]), k, _location(grid, i, j)
+
+
+def _location(grid: Grid, i: int, j: int) -> Location:
+    # the center of a square like `IrregularGridLocations` outside of a
+    # builder
+    x = 42 * (j - (grid.n_cols - 1) / 2)
+    y = 42 * ((grid.n_rows - 1) / 2 - i)
+    return Location((x, y, 0))
+
+
+def _prefab(
+    pattern: Pattern,
+    height: float,
+    compartment: str | None,
+    stacking_lip: str | None,
+    detail: Detail,
+) -> Part | None:
+    # the center square of a bin of the neighborhood, centered on the
+    # origin, `None` if it is empty
+    def build() -> Part | None:
+        with stage("TiledBin.prefab") as s:
+            c, *p = pattern
+            grid = Grid(
+                [[p[7], p[0], p[1]], [p[6], c, p[2]], [p[5], p[4], p[3]]]
+            )
+            center = _location(grid, 1, 1)
+            part = _bin(grid, height, compartment, stacking_lip, detail)
+            box = Solid.make_box(42, 42, height + 10).moved(
+                center * Location((-21, -21, -1))
+            )
+            solids = (part & box).solids()
+            if not solids:
+                return None
+            square = Part(solids).moved(center.inverse())
+            s.result(square)
+        return square
+
+    return cached(
+        ("TiledBin", pattern, height, compartment, stacking_lip, detail),
+        build,
+    )
@@ -0,0 +1,166 @@
+"""Topology of grids, computed before any shape is built.
+
+    t = gf.topology.analyze([[True, False, True]])
+    t.islands  # two islands of a single cell
+    gf.topology.validate(grid, allow_islands=False)  # raises ValueError
+
+The islands are found by a flood fill over the bit masks of the rows.
+Cells that only touch at a corner belong to different islands, as they
+do in `GridSketch`. The number of holes follows from the Euler
+characteristic of the cells, which is counted from the masks as well.
+A grid of 10x10 cells is analyzed in well under a millisecond.
+"""
+
+import dataclasses
+import typing
+
+from .types import Grid, GridLike
+
+
+class Island(typing.NamedTuple):
+    row: int  # of its first row within the grid
+    col: int  # of its first column within the grid
+    grid: Grid  # its cells within its bounding box
+
+
+@dataclasses.dataclass(frozen=True)
+class Topology:
+    cells: int
+    islands: tuple[Island, ...]
+    holes: int
+    # (row, column) of the upper left cell of each 2x2 block in which two
+    # cells only touch at a corner
+    corner_contacts: tuple[tuple[int, int], ...]
+    empty_rows: tuple[int, ...]
+    empty_cols: tuple[int, ...]
+
+    @property
+    def euler(self) -> int:
+        """The Euler characteristic, the islands less the holes."""
+        return len(self.islands) - self.holes
+
+
+def analyze(grid: GridLike) -> Topology:
+    """Find the islands, holes and cells touching at a corner of a grid."""
+    grid = Grid(grid)
+    masks = list(grid.masks)
+
+    islands = []
+    rest = list(masks)
+    for i in range(len(rest)):
+        while rest[i]:
+            seed = [0] * len(rest)
+            seed[i] = rest[i] & -rest[i]
+            island = _fill(rest, seed)
+            rest = [r & ~m for r, m in zip(rest, island, strict=True)]
+            islands.append(_island(island))
+
+    contacts = []
+    for i, (a, b) in enumerate(zip(masks, masks[1:], strict=False)):
+        # one diagonal pair of a 2x2 block without the other
+        touching = a & b >> 1 & ~(a >> 1) & ~b | a >> 1 & b & ~a & ~(b >> 1)
+        contacts += [
+            (i, j) for j in range(touching.bit_length()) if touching >> j & 1
+        ]
+
+    return Topology(
+        cells=grid.count,
+        islands=tuple(islands),
+        holes=len(islands) - _euler(masks, len(contacts)),
+        corner_contacts=tuple(contacts),
+        empty_rows=tuple(i for i, m in enumerate(masks) if not m),
+        empty_cols=tuple(
+            j for j, extent in enumerate(grid.col_extents) if extent is None
+        ),
+    )
+
+
+def validate(
+    grid: GridLike,
+    allow_islands: bool = True,
+    allow_holes: bool = True,
+    allow_corner_contacts: bool = True,
+    allow_empty_lines: bool = True,
+) -> Topology:
+    """Analyze a grid and reject it if it has features not allowed.
+
+    Raises a `ValueError` listing all of them, grids without any cells
+    are always rejected.
+    """
+    t = analyze(grid)
+    if not t.cells:
+        raise ValueError("Grid does not contain any cells")
+    problems = []
+    if not allow_islands and len(t.islands) > 1:
+        problems.append(f"{len(t.islands)} islands")
+    if not allow_holes and t.holes:
+        problems.append(f"{t.holes} holes")
+    if not allow_corner_contacts and t.corner_contacts:
+        problems.append(
+            "cells touching only at a corner at "
+            + ", ".join(f"{i},{j}" for i, j in t.corner_contacts)
+        )
+    if not allow_empty_lines and (t.empty_rows or t.empty_cols):
+        problems.append(
+            f"empty rows {list(t.empty_rows)} and columns {list(t.empty_cols)}"
+        )
+    if problems:
+        raise ValueError("Invalid grid: " + "; ".join(problems))
+    return t
+
+
+def split(grid: GridLike) -> list[Island]:
+    """The islands of a grid, each of which can be built on its own."""
+    return list(analyze(grid).islands)
+
+
+def _fill(masks: list[int], seed: list[int]) -> list[int]:
+    # grows the seed to all cells connected to it by an edge
+    n = len(masks)
+    region = seed
+    while True:
+        grown = [
+            (
+                m
+                | m << 1
+                | m >> 1
+                | (region[i - 1] if i else 0)
+                | (region[i + 1] if i + 1 < n else 0)
+            )
+            & masks[i]
+            for i, m in enumerate(region)
+        ]
+        if grown == region:
+            return region
+        region = grown
+
+
+def _island(region: list[int]) -> Island:
+    rows = [i for i, m in enumerate(region) if m]
+    first, last = rows[0], rows[-1]
+    col = min((m & -m).bit_length() - 1 for m in region if m)
+    width = max(m.bit_length() for m in region) - col
+    return Island(
+        first,
+        col,
+        Grid(
+            [
+                [bool(m >> (col + j) & 1) for j in range(width)]
+                for m in region[first : last + 1]
+            ]
+        ),
+    )
+
+
+def _euler(masks: list[int], contacts: int) -> int:
+    # vertices - edges + faces of the cells on the lattice
+    rows = [0, *masks, 0]
+    pairs = [a | b for a, b in zip(rows, rows[1:], strict=False)]
+    faces = sum(m.bit_count() for m in masks)
+    # edges between two rows and between two cells of a row
+    edges = sum(p.bit_count() for p in pairs) + sum(
+        (m | m << 1).bit_count() for m in masks
+    )
+    # a corner where cells only touch counts once for each of them
+    vertices = sum((p | p << 1).bit_count() for p in pairs) + contacts
+    return vertices - edges + faces
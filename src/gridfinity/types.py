@@ -1 +1,132 @@
-Grid = list[list[bool]]
+from collections.abc import Iterator, Sequence
+from typing import Literal
+
+
+class Grid:
+    """Immutable layout of grid cells.
+
+    Rows are given from back to front and cells from left to right, each
+    row is stored bit-packed as an integer. Ragged rows are padded and
+    trailing empty rows and columns are trimmed, so equal layouts compare
+    and hash equal regardless of how they were written down:
+    `Grid([[True, False], [False, False]]) == Grid([[True]])`. Grids are
+    the keys of the caches, such layouts share their cached shapes.
+    Leading empty rows and columns are kept, they move the cells.
+    """
+
+    __slots__ = (
+        "masks",
+        "n_rows",
+        "n_cols",
+        "indices",
+        "row_extents",
+        "col_extents",
+        "_hash",
+    )
+
+    masks: tuple[int, ...]
+    n_rows: int
+    n_cols: int
+    indices: tuple[tuple[int, int], ...]
+    row_extents: tuple[tuple[int, int] | None, ...]
+    col_extents: tuple[tuple[int, int] | None, ...]
+
+    def __init__(self, rows: "GridLike"):
+        if isinstance(rows, Grid):
+            masks = list(rows.masks)
+        else:
+            masks = [
+                sum(1 << j for j, val in enumerate(row) if val) for row in rows
+            ]
+        while masks and not masks[-1]:
+            masks.pop()
+
+        n_cols = max((m.bit_length() for m in masks), default=0)
+        indices = tuple(
+            (i, j)
+            for i, m in enumerate(masks)
+            for j in range(m.bit_length())
+            if m >> j & 1
+        )
+
+        def extent(values: list[int]) -> tuple[int, int] | None:
+            return (min(values), max(values)) if values else None
+
+        row_extents = tuple(
+            extent([j for j in range(m.bit_length()) if m >> j & 1])
+            for m in masks
+        )
+        col_extents = tuple(
+            extent([i for i, m in enumerate(masks) if m >> j & 1])
+            for j in range(n_cols)
+        )
+
+        _set = object.__setattr__
+        _set(self, "masks", tuple(masks))
+        _set(self, "n_rows", len(masks))
+        _set(self, "n_cols", n_cols)
+        _set(self, "indices", indices)
+        _set(self, "row_extents", row_extents)
+        _set(self, "col_extents", col_extents)
+        _set(self, "_hash", hash(self.masks))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """Bounding size as (columns, rows)."""
+        return self.n_cols, self.n_rows
+
+    @property
+    def count(self) -> int:
+        """Number of cells."""
+        return len(self.indices)
+
+    def __getitem__(self, i: int) -> tuple[bool, ...]:
+        m = self.masks[i]
+        return tuple(bool(m >> j & 1) for j in range(self.n_cols))
+
+    def __iter__(self) -> Iterator[tuple[bool, ...]]:
+        return (self[i] for i in range(self.n_rows))
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    def __contains__(self, cell: object) -> bool:
+        if not isinstance(cell, tuple) or len(cell) != 2:
+            return False
+        i, j = cell
+        if not 0 <= i < self.n_rows or j < 0:
+            return False
+        return bool(self.masks[i] >> j & 1)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.masks == other.masks
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        rows = ", ".join(
+            "[" + ", ".join(str(v) for v in row) + "]" for row in self
+        )
+        return f"{type(self).__name__}([{rows}])"
+
+    def __reduce__(self):
+        return type(self), ([list(row) for row in self],)
+
+
+GridLike = Grid | Sequence[Sequence[bool]]
+
+# "preview" skips fillets and tapers while keeping the outer dimensions
+Detail = Literal["preview", "print"]
+
+
+def check_detail(detail: str) -> None:
+    if detail not in ("preview", "print"):
+        raise ValueError(
+            f"Invalid detail: '{detail}'. Expected 'preview' or 'print'"
+        )
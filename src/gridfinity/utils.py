@@ -10,7 +10,7 @@ from build123d import (
     to_align_offset,
 )
 
-from .types import Grid
+from .types import Grid, GridLike
 
 
 def faces_xy(p: BuildPart) -> list[Face]:
@@ -22,18 +22,14 @@ class IrregularGridLocations(Locations):
         self,
         x_spacing: float,
         y_spacing: float,
-        grid: Grid,
+        grid: GridLike,
         align: Align | tuple[Align, Align] = (Align.CENTER, Align.CENTER),
     ):
-        indices = [
-            (i, j)
-            for i, row in enumerate(grid)
-            for j, val in enumerate(row)
-            if val
-        ]
-
-        n_rows = max(i for i, j in indices) + 1
-        n_cols = max(j for i, j in indices) + 1
+        grid = Grid(grid)
+        indices = grid.indices
+        n_rows, n_cols = grid.n_rows, grid.n_cols
+        if not indices:
+            raise ValueError("Grid does not contain any cells")
 
         size = [x_spacing * (n_cols - 1), y_spacing * (n_rows - 1)]
         align_offset = to_align_offset((0, 0), size, align)
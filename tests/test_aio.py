@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from gridfinity import aio
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    # builds block until released and return the spec instead of a part
+    specs = []
+    release = threading.Event()
+
+    def build(spec):
+        specs.append(spec)
+        release.wait(5)
+        return spec
+
+    monkeypatch.setattr(aio.batch, "build", build)
+    with ThreadPoolExecutor(4) as executor:
+        aio.set_executor(executor)
+        yield specs, release
+        release.set()
+        aio.set_executor(None)
+    assert not aio._builds
+
+
+async def started(specs, n):
+    while len(specs) < n:
+        await asyncio.sleep(0.001)
+
+
+def test_coalesced(builds):
+    specs, release = builds
+
+    async def main():
+        a = asyncio.ensure_future(aio.build_bin({"grid": "1x1", "height": 7}))
+        b = asyncio.ensure_future(
+            aio.build_bin({"type": "Bin", "grid": "1x1", "height": 7.0})
+        )
+        c = asyncio.ensure_future(aio.build_bin({"grid": "1x1", "height": 14}))
+        await started(specs, 2)
+        release.set()
+        return await asyncio.gather(a, b, c)
+
+    a, b, c = asyncio.run(main())
+    # equal specs share one build and its part
+    assert a is b
+    assert c["height"] == 14
+    assert len(specs) == 2
+
+
+def test_timeout(builds):
+    specs, release = builds
+
+    async def main():
+        with pytest.raises(TimeoutError):
+            await aio.build_bin({"grid": "1x1", "height": 7}, timeout=0.05)
+        # nobody waits anymore, a new request starts another build
+        assert not aio._builds
+        request = aio.build_bin({"grid": "1x1", "height": 7})
+        task = asyncio.ensure_future(request)
+        await started(specs, 2)
+        release.set()
+        return await task
+
+    assert asyncio.run(main())["height"] == 7
+    assert len(specs) == 2
+
+
+def test_cancelled_while_others_wait(builds):
+    specs, release = builds
+
+    async def main():
+        spec = {"grid": "1x1", "height": 7}
+        a = asyncio.ensure_future(aio.build_bin(spec))
+        b = asyncio.ensure_future(aio.build_bin(spec))
+        await started(specs, 1)
+        a.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await a
+        # the build is shielded from the cancelled request
+        assert not b.done()
+        release.set()
+        return await b
+
+    assert asyncio.run(main())["height"] == 7
+    assert len(specs) == 1
+
+
+def test_build_many_fails(builds, monkeypatch):
+    specs, release = builds
+    blocking = aio.batch.build
+
+    def build(spec):
+        if spec["height"] == 0:
+            raise ValueError("too low")
+        return blocking(spec)
+
+    monkeypatch.setattr(aio.batch, "build", build)
+
+    async def main():
+        await aio.build_many(
+            [{"grid": "1x1", "height": 7}, {"grid": "1x1", "height": 0}]
+        )
+
+    # the other build is cancelled while it still runs
+    with pytest.raises(ValueError, match="too low"):
+        asyncio.run(main())
+    assert not release.is_set()
@@ -0,0 +1,38 @@
+from gridfinity import batch
+
+
+def test_digest_of_whole_numbers():
+    specs = [
+        {"type": "Bin", "grid": "2x1", "height": height, "compartment": c}
+        for height, c in [
+            (21, {"div_x": 2, "div_y": 1}),
+            (21.0, {"div_x": 2.0, "div_y": 1}),
+        ]
+    ]
+    a, b = (batch.normalize(spec) for spec in specs)
+    assert a == b
+    assert batch.digest(specs[0]) == batch.digest(specs[1])
+    assert batch.default_name(a) == batch.default_name(b)
+    assert batch.digest({**specs[0], "height": 21.5}) != batch.digest(specs[0])
+
+
+def test_names_of_distinct_specs():
+    specs = batch.expand(
+        [
+            {"type": "Bin", "grid": "1x1", "name": "bin", "height": 14},
+            {"type": "Bin", "grid": "1x1", "height": 14.0, "name": "copy"},
+            {
+                "type": "Bin",
+                "grid": "2x1",
+                "name": "tall",
+                "matrix": {"height": [21, 28]},
+            },
+            {"type": "Bin", "grid": "2x1", "height": 28, "name": "tall"},
+        ]
+    )
+    unique, duplicates = batch._plan(specs)
+    names = sorted(name for _, name in unique.values())
+    keys = [batch.digest(spec)[:8] for spec in specs[2:]]
+    assert names == sorted(["bin", f"tall_{keys[0]}", f"tall_{keys[1]}"])
+    # equal specs are listed with the name of the built one
+    assert duplicates == {"bin": ["copy"]}
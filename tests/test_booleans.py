@@ -0,0 +1,35 @@
+import pytest
+from build123d import Box, Cylinder, Location, Pos
+
+import gridfinity as gf
+
+
+def test_cut_matches_sequential_cuts():
+    part = gf.Bin([[True] * 2], 21)
+    hole = Cylinder(3, 20)
+    places = [(x, y, 5) for x in range(-30, 31, 10) for y in (-10, 10)]
+    # shapes, placed shapes and locations mixed
+    tools = [
+        hole.moved(Location(places[0])),
+        *((hole, Location(p)) for p in places[1:4]),
+        *((hole, p) for p in places[4:]),
+    ]
+    single = gf.booleans.cut(part, tools)
+    sequential = part
+    for p in places:
+        sequential = sequential - Pos(*p) * hole
+    assert single.is_valid
+    assert single.volume == pytest.approx(sequential.volume, rel=1e-9)
+    assert single.volume < part.volume
+    assert gf.booleans.cut(part, []).volume == pytest.approx(part.volume)
+
+
+def test_fuse_glue():
+    box = Box(10, 10, 10)
+    tools = [(box, (10 * k, 0, 0)) for k in range(1, 5)]
+    glued = gf.booleans.fuse(box, tools, glue=True)
+    assert glued.is_valid
+    assert len(glued.solids()) == 1
+    assert len(glued.faces()) == 6
+    assert glued.volume == pytest.approx(5000)
+    assert glued.volume == pytest.approx(gf.booleans.fuse(box, tools).volume)
@@ -0,0 +1,123 @@
+import os
+
+import pytest
+from build123d import Part, Solid
+
+import gridfinity as gf
+from gridfinity.cache import cached, stored
+
+
+@pytest.fixture
+def cache():
+    gf.cache.clear()
+    limit = gf.cache.max_size()
+    yield
+    gf.cache.set_max_size(limit)
+    gf.cache.clear()
+
+
+def test_hits_and_eviction(cache):
+    builds = []
+
+    def build(key):
+        builds.append(key)
+        return [key]
+
+    gf.cache.set_max_size(2)
+    a = cached("a", lambda: build("a"))
+    assert cached("a", lambda: build("a")) is a
+    cached("b", lambda: build("b"))
+    # "a" was used last, so "b" is dropped for "c"
+    assert cached("a", lambda: build("a")) is a
+    cached("c", lambda: build("c"))
+    assert gf.cache.size() == 2
+    cached("a", lambda: build("a"))
+    cached("b", lambda: build("b"))
+    assert builds == ["a", "b", "c", "b"]
+
+    gf.cache.set_max_size(1)
+    assert gf.cache.size() == 1
+    cached("b", lambda: build("b"))
+    assert builds == ["a", "b", "c", "b"]
+
+
+def test_no_limit(cache):
+    gf.cache.set_max_size(None)
+    for k in range(2000):
+        cached(("key", k), lambda k=k: k)
+    assert gf.cache.size() == 2000
+    with pytest.raises(ValueError):
+        gf.cache.set_max_size(-1)
+
+
+@pytest.fixture
+def disk(tmp_path):
+    previous = gf.cache._disk
+    gf.cache.enable_disk(tmp_path, max_bytes=None)
+    yield tmp_path
+    gf.cache._disk = previous
+
+
+def box(size):
+    return Part([Solid.make_box(size, size, size)])
+
+
+def test_disk_round_trip(disk):
+    builds = []
+
+    def build():
+        builds.append(1)
+        return box(2)
+
+    part = stored("Test", dict(size=2), build)
+    (entry,) = disk.iterdir()
+    assert entry.suffix == ".brep"
+    loaded = stored("Test", dict(size=2), build)
+    assert builds == [1]
+    assert loaded.volume == pytest.approx(part.volume)
+    assert gf.cache.disk_usage() == entry.stat().st_size
+
+    # another parameter is another entry, unreadable entries are rebuilt
+    stored("Test", dict(size=3), lambda: box(3))
+    assert len(list(disk.iterdir())) == 2
+    entry.write_bytes(b"garbage")
+    assert stored("Test", dict(size=2), build).volume == pytest.approx(8)
+    assert builds == [1, 1]
+    # written to a temporary file first, none are left behind
+    assert not list(disk.glob("*.tmp"))
+
+    gf.cache.clear_disk()
+    assert gf.cache.disk_usage() == 0
+
+
+def test_disk_eviction(disk):
+    def entry(size):
+        return disk / f"{gf.cache._digest('Test', dict(size=size))}.brep"
+
+    for size in (1, 2, 3):
+        stored("Test", dict(size=size), lambda size=size: box(size))
+        # distinct times of use, the first entry is the oldest
+        os.utime(entry(size), (1000 * size, 1000 * size))
+    # loading an entry marks it as used
+    stored("Test", dict(size=1), lambda: box(1))
+    assert entry(1).stat().st_mtime > entry(3).stat().st_mtime
+
+    # room for all but one entry
+    total = gf.cache.disk_usage() + len(gf.cache.serialize(box(4)))
+    gf.cache.enable_disk(disk, max_bytes=total - 1)
+    stored("Test", dict(size=4), lambda: box(4))
+    assert not entry(2).exists()
+    assert all(entry(size).exists() for size in (1, 3, 4))
+
+
+def test_disk_write_is_atomic(disk, monkeypatch):
+    def fail(src, dst):
+        # the entry is only visible once renamed
+        assert not list(disk.glob("*.brep"))
+        assert len(list(disk.glob("*.tmp"))) == 1
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    with pytest.raises(OSError, match="disk full"):
+        stored("Test", dict(size=1), lambda: box(1))
+    assert not list(disk.iterdir())
@@ -0,0 +1,28 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import gridfinity as gf
+
+
+@pytest.mark.parametrize("detail", ["print", "preview"])
+def test_same_bin_from_threads(detail):
+    grid = [[True, True, True], [True, False, True]]
+    expected = gf.Bin(grid, 21, detail=detail).volume
+
+    # empty caches, so that the threads race for the shared shapes
+    gf.cache.clear()
+    with ThreadPoolExecutor(8) as pool:
+        volumes = list(
+            pool.map(
+                lambda _: gf.Bin(grid, 21, detail=detail).volume, range(8)
+            )
+        )
+    assert volumes == [expected] * 8
+
+
+def test_lazy_bin_shared_by_threads():
+    lazy = gf.Bin.spec([[True] * 2], 14)
+    with ThreadPoolExecutor(4) as pool:
+        volumes = set(pool.map(lambda _: lazy.volume, range(8)))
+    assert len(volumes) == 1
@@ -0,0 +1,56 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from build123d import Box, Pos, Shape
+
+import gridfinity as gf
+from gridfinity import config
+
+
+def test_fuzzy_joins_nearly_touching_shapes():
+    a = Box(10, 10, 10)
+    # apart by more than the tolerance of the shapes
+    b = Pos(10 + 1e-5, 0, 0) * Box(10, 10, 10)
+    assert len(gf.booleans.fuse(a, [b]).solids()) == 2
+    with config.options(fuzzy=1e-4) as options:
+        assert options.fuzzy == 1e-4
+        assert len(gf.booleans.fuse(a, [b]).solids()) == 1
+        # build123d booleans only within a scope
+        assert len((a + b).solids()) == 2
+        with config.scope():
+            assert len((a + b).solids()) == 1
+    with config.scope():
+        assert len((a + b).solids()) == 2
+    assert config.get() == config.DEFAULT
+
+
+def test_bool_op_restored_after_nested_scopes():
+    original = Shape.__dict__["_bool_op"]
+    with config.scope():
+        assert Shape.__dict__["_bool_op"] is config._bool_op
+        with config.scope():
+            assert Shape.__dict__["_bool_op"] is config._bool_op
+        assert Shape.__dict__["_bool_op"] is config._bool_op
+    assert Shape.__dict__["_bool_op"] is original
+
+
+def test_bool_op_restored_after_concurrent_scopes():
+    original = Shape.__dict__["_bool_op"]
+    n = 8
+    entered = threading.Barrier(n)
+    a, b = Box(10, 10, 10), Pos(5, 0, 0) * Box(10, 10, 10)
+
+    def work(k):
+        with config.options(fuzzy=1e-6 * k), config.scope():
+            entered.wait()
+            volume = (a + b).volume
+            # none leaves while others still run their booleans
+            entered.wait()
+            return volume, config.get().fuzzy
+
+    with ThreadPoolExecutor(n) as pool:
+        results = list(pool.map(work, range(n)))
+    assert [fuzzy for _, fuzzy in results] == [1e-6 * k for k in range(n)]
+    assert all(abs(volume - 1500) < 1e-6 for volume, _ in results)
+    assert Shape.__dict__["_bool_op"] is original
+    assert config._active == 0
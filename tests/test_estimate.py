@@ -0,0 +1,28 @@
+import pytest
+
+import gridfinity as gf
+
+T, F = True, False
+
+# the relative error of the volume. The lip and the compartment are
+# approximated at concave corners
+GRIDS = {
+    "rectangular": ([[T] * 3] * 2, 1e-6),
+    "L": ([[T, T, T], [T, F, F], [T, F, F]], 5e-4),
+    "diagonal": ([[T, F], [F, T]], 1e-6),
+    "holed": ([[T, T, T], [T, F, T], [T, T, T]], 5e-4),
+}
+
+
+@pytest.mark.parametrize("detail", ["print", "preview"])
+@pytest.mark.parametrize("name", GRIDS)
+def test_estimate_matches_bin(name, detail):
+    grid, tolerance = GRIDS[name]
+    part = gf.Bin(grid, 21, detail=detail)
+    props = gf.estimate.bin_properties(grid, 21, detail=detail)
+    assert props.volume == pytest.approx(part.volume, rel=tolerance)
+
+    box = part.bounding_box()
+    lo, hi = gf.estimate.bin_bounds(grid, 21)
+    assert (*lo, *hi) == pytest.approx((*box.min, *box.max), abs=1e-6)
+    assert props.size == pytest.approx(tuple(box.size), abs=1e-6)
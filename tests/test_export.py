@@ -0,0 +1,110 @@
+import zipfile
+from xml.etree import ElementTree
+
+import numpy as np
+import pytest
+from build123d import import_step
+
+import gridfinity as gf
+from gridfinity.export import _STL
+
+T, F = True, False
+
+
+def assert_closed(mesh):
+    faces = mesh.faces
+    edges = np.concatenate(
+        [faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]]
+    )
+    directed = {tuple(e) for e in edges}
+    assert len(directed) == len(edges)
+    assert all((b, a) in directed for a, b in directed)
+
+
+@pytest.mark.parametrize(
+    "grid", [[[T] * 2] * 2, [[T, T, T], [T, F, F], [T, F, F]]]
+)
+def test_tessellate(grid):
+    part = gf.Bin(grid, 21)
+    mesh = gf.export.tessellate(part, tolerance=1e-3)
+    # the faces share their points, the welded mesh is closed
+    assert_closed(mesh)
+    assert mesh.volume == pytest.approx(part.volume, rel=1e-4)
+    box = part.bounding_box()
+    assert (*mesh.vertices.min(axis=0), *mesh.vertices.max(axis=0)) == (
+        pytest.approx((*box.min, *box.max), abs=1e-3)
+    )
+
+
+def test_write_stl(tmp_path):
+    part = gf.Bin([[T]], 14)
+    gf.export.write_stl(part, tmp_path / "part.stl")
+    mesh = gf.mesh.bin_mesh([[T]], 14)
+    gf.export.write_stl(mesh, tmp_path / "mesh.stl")
+    for name, volume in [("part", part.volume), ("mesh", mesh.volume)]:
+        data = (tmp_path / f"{name}.stl").read_bytes()
+        assert not data.startswith(b"solid")
+        (n,) = np.frombuffer(data, "<u4", 1, 80)
+        points = np.frombuffer(data, _STL, n, 84)["points"].astype(float)
+        a, b, c = points[:, 0], points[:, 1], points[:, 2]
+        stl_volume = np.einsum("ij,ij->i", a, np.cross(b, c)).sum() / 6
+        assert stl_volume == pytest.approx(volume, rel=1e-4)
+
+
+def read_3mf(path):
+    # the volume of the built object, placing its components
+    ns = {"m": "http://schemas.microsoft.com/3dmanufacturing/core/2015/02"}
+    with zipfile.ZipFile(path) as z:
+        root = ElementTree.fromstring(z.read("3D/3dmodel.model"))
+    volumes, placed = {}, []
+    for obj in root.iterfind("m:resources/m:object", ns):
+        mesh = obj.find("m:mesh", ns)
+        if mesh is None:
+            placed = [
+                (c.get("objectid"), c.get("transform"))
+                for c in obj.iterfind("m:components/m:component", ns)
+            ]
+            continue
+        vertices = np.array(
+            [
+                [float(v.get(k)) for k in "xyz"]
+                for v in mesh.iterfind("m:vertices/m:vertex", ns)
+            ]
+        )
+        faces = np.array(
+            [
+                [int(t.get(k)) for k in ("v1", "v2", "v3")]
+                for t in mesh.iterfind("m:triangles/m:triangle", ns)
+            ]
+        )
+        volumes[obj.get("id")] = gf.mesh.Mesh(vertices, faces).volume
+    total = 0.0
+    for object_id, transform in placed:
+        matrix = np.array([float(v) for v in transform.split()])
+        # placements do not scale the parts
+        assert abs(np.linalg.det(matrix[:9].reshape(3, 3))) == (
+            pytest.approx(1)
+        )
+        total += volumes[object_id]
+    return total, len(placed)
+
+
+def test_instances_round_trip(tmp_path):
+    grid = [[T] * 2] * 2
+    part = gf.Bin(grid, 21)
+    instances = gf.export.bin_instances(grid, 21)
+
+    gf.export.write_3mf_instances(instances, tmp_path / "bin.3mf")
+    volume, placements = read_3mf(tmp_path / "bin.3mf")
+    assert placements == 5
+    assert volume == pytest.approx(part.volume, rel=1e-4)
+
+    gf.export.write_step_instances(instances, tmp_path / "bin.step")
+    imported = import_step(tmp_path / "bin.step")
+    assert len(imported.solids()) == 5
+    assert imported.volume == pytest.approx(part.volume, rel=1e-6)
+    box = part.bounding_box()
+    other = imported.bounding_box()
+    assert (*other.min, *other.max) == pytest.approx(
+        (*box.min, *box.max), abs=1e-3
+    )
@@ -0,0 +1,40 @@
+import pickle
+
+from gridfinity.types import Grid
+
+T, F = True, False
+
+
+def test_trailing_empty_cells_are_trimmed():
+    grid = Grid([[T, F], [F, F]])
+    assert grid == Grid([[T]])
+    assert hash(grid) == hash(Grid([[T]]))
+    assert grid.size == (1, 1)
+    assert len({grid, Grid([[T]]), Grid([[T, F, F]])}) == 1
+    # leading empty rows and columns move the cells
+    assert Grid([[F, T]]) != Grid([[T]])
+    assert Grid([[F], [T]]) != Grid([[T]])
+
+
+def test_ragged_rows():
+    grid = Grid([[T, T, T], [T], [T, T]])
+    assert grid.size == (3, 3)
+    assert list(grid) == [(T, T, T), (T, F, F), (T, T, F)]
+    assert grid.count == 6
+    assert (1, 0) in grid and (1, 1) not in grid and (5, 0) not in grid
+
+
+def test_pickle():
+    grid = Grid([[T, F, T], [F, T]])
+    copy = pickle.loads(pickle.dumps(grid))
+    assert copy == grid
+    assert hash(copy) == hash(grid)
+    assert copy.masks == grid.masks
+
+
+def test_extents():
+    grid = Grid([[F, T, T], [F, F, F], [T, F, T]])
+    assert grid.row_extents == ((1, 2), None, (0, 2))
+    assert grid.col_extents == ((2, 2), (0, 0), (0, 2))
+    assert Grid([]).row_extents == ()
+    assert Grid([]).col_extents == ()
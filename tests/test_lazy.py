@@ -0,0 +1,35 @@
+import copy
+import pickle
+
+import gridfinity as gf
+
+
+def test_not_built_by_attributes():
+    lazy = gf.Bin.spec([[True] * 2], 14)
+    assert repr(lazy).startswith("LazyBin(grid=Grid([[True, True]])")
+    lazy.label = "bin"
+    assert lazy.color is None
+    assert lazy.children == ()
+    lazy.bounding_box()
+    for other in (
+        copy.copy(lazy),
+        copy.deepcopy(lazy),
+        pickle.loads(pickle.dumps(lazy)),
+    ):
+        assert not other.built
+        assert other.label == "bin"
+        assert other.params == lazy.params
+    assert not lazy.built
+
+
+def test_copies_of_built_bin():
+    lazy = gf.Bin.spec([[True]], 14, rotation=(0, 0, 90))
+    lazy.label = "bin"
+    volume = lazy.volume
+    for other in (
+        copy.copy(lazy),
+        copy.deepcopy(lazy),
+        pickle.loads(pickle.dumps(lazy)),
+    ):
+        assert other.label == "bin"
+        assert other.volume == volume
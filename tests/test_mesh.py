@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import gridfinity as gf
+
+T, F = True, False
+
+
+def assert_closed(mesh):
+    faces = mesh.faces
+    edges = np.concatenate(
+        [faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]]
+    )
+    # every edge is used once in each direction by consistently oriented
+    # faces
+    directed = {tuple(e) for e in edges}
+    assert len(directed) == len(edges)
+    assert all((b, a) in directed for a, b in directed)
+    assert len(np.unique(faces)) == len(mesh.vertices)
+
+
+@pytest.mark.parametrize("detail", ["print", "preview"])
+@pytest.mark.parametrize("compartment, stacking_lip", [(T, T), (T, F), (F, F)])
+@pytest.mark.parametrize("grid", [[[T]], [[T] * 3] * 2])
+def test_same_as_bin(grid, compartment, stacking_lip, detail):
+    mesh = gf.mesh.bin_mesh(
+        grid, 21, compartment, stacking_lip, detail, segments=32
+    )
+    assert_closed(mesh)
+    part = gf.Bin(
+        grid,
+        21,
+        compartment="default" if compartment else None,
+        stacking_lip="default" if stacking_lip else None,
+        detail=detail,
+    )
+    # the rounded corners are split into segments
+    tolerance = 5e-5 if detail == "print" else 1e-9
+    assert mesh.volume == pytest.approx(part.volume, rel=tolerance)
+    box = part.bounding_box()
+    assert (*mesh.vertices.min(axis=0), *mesh.vertices.max(axis=0)) == (
+        pytest.approx((*box.min, *box.max), abs=1e-6)
+    )
+
+
+def test_unsupported():
+    with pytest.raises(ValueError, match="rectangular grids"):
+        gf.mesh.bin_mesh([[T, T], [T, F]], 21)
+    compartment = gf.extra.SubdividedCompartment([[T]], 14, div_x=2, div_y=1)
+    with pytest.raises(ValueError, match="default compartment"):
+        gf.mesh.bin_mesh([[T]], 21, compartment=compartment)
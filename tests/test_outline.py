@@ -0,0 +1,53 @@
+import pytest
+from build123d import (
+    BuildSketch,
+    Kind,
+    Plane,
+    Rectangle,
+    fillet,
+    offset,
+)
+
+import gridfinity as gf
+from gridfinity.utils import IrregularGridLocations
+
+T, F = True, False
+
+GRIDS = {
+    "rectangular": [[T] * 3] * 2,
+    "L": [[T, T, T], [T, F, F], [T, F, F]],
+    "holed": [[T, T, T], [T, F, T], [T, T, T]],
+    "diagonal": [[T, F], [F, T]],
+}
+
+
+def previous(grid, inset, with_fillet):
+    # `GridSketch` as built before from fused and offset cells
+    with BuildSketch(Plane.XY) as s:
+        with IrregularGridLocations(42, 42, grid):
+            Rectangle(42, 42)
+        offset(amount=-inset, kind=Kind.INTERSECTION)
+        if with_fillet:
+            fillet(s.vertices(), radius=4 - inset)
+    return s.sketch
+
+
+@pytest.mark.parametrize("with_fillet", [True, False])
+@pytest.mark.parametrize("inset", [0.25, 1.25])
+@pytest.mark.parametrize("name", GRIDS)
+def test_same_as_previous_sketch(name, inset, with_fillet):
+    grid = GRIDS[name]
+    sketch = gf.GridSketch(grid, inset=inset, with_fillet=with_fillet)
+    expected = previous(grid, inset, with_fillet)
+    assert sketch.area == pytest.approx(expected.area, abs=1e-6)
+    box, expected_box = sketch.bounding_box(), expected.bounding_box()
+    assert (*box.min, *box.max) == pytest.approx(
+        (*expected_box.min, *expected_box.max), abs=1e-6
+    )
+
+
+def test_faces_of_islands_and_holes():
+    assert len(gf.GridSketch(GRIDS["diagonal"]).faces()) == 2
+    holed = gf.GridSketch(GRIDS["holed"]).faces()
+    assert len(holed) == 1
+    assert len(holed[0].inner_wires()) == 1
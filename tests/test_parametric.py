@@ -0,0 +1,17 @@
+import pytest
+
+import gridfinity as gf
+from gridfinity.parametric import ParametricBin
+
+
+@pytest.mark.parametrize("grid", [[], [[False, False]]])
+def test_empty_grid(grid):
+    with pytest.raises(ValueError, match="does not contain any cells"):
+        ParametricBin(grid, 14)
+    with pytest.raises(ValueError, match="does not contain any cells"):
+        gf.Bin.spec(grid, 14)
+
+    part = ParametricBin([[True]], 14)
+    with pytest.raises(ValueError, match="does not contain any cells"):
+        part.grid = grid
+    assert part.grid == gf.types.Grid([[True]])
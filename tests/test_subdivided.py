@@ -0,0 +1,92 @@
+import pytest
+
+import gridfinity as gf
+
+# volume and bounding box of the SubdividedCompartment of a 2x2 grid, 14
+# high, as built by the original implementation that filleted the
+# dividers and the pockets of the whole compartment at once
+BASELINE = [
+    (
+        dict(div_x=2, div_y=1),
+        90913.066,
+        (-40.75, -40.75, -14.0, 40.75, 40.75, 0.0),
+    ),
+    (
+        dict(
+            div_x=1,
+            div_y=3,
+            div_cutout_width=10,
+            div_cutout_height=5,
+            with_label=True,
+            scoops=["back"],
+        ),
+        81777.31,
+        (-39.15, -40.75, -14.0, 40.75, 40.75, 0.0),
+    ),
+    (
+        dict(div_x=3, div_y=2, scoops=["front", "left"]),
+        82893.065,
+        (-40.75, -40.75, -14.0, 39.15, 39.15, 0.0),
+    ),
+    (
+        dict(
+            div_x=3,
+            div_y=2,
+            div_cutout_width=10,
+            div_cutout_height=5,
+            with_label=True,
+        ),
+        82793.414,
+        (-40.75, -40.75, -14.0, 40.75, 40.75, 0.0),
+    ),
+    (
+        dict(
+            div_x=2,
+            div_y=1,
+            div_cutout_width=10,
+            div_cutout_height=5,
+            scoops=["front", "left"],
+        ),
+        85915.263,
+        (-40.75, -40.75, -14.0, 39.15, 39.15, 0.0),
+    ),
+    (
+        dict(
+            div_x=3,
+            div_y=2,
+            div_cutout_width=10,
+            div_cutout_height=5,
+            scoops=["back"],
+        ),
+        85713.937,
+        (-39.15, -40.75, -14.0, 40.75, 40.75, 0.0),
+    ),
+]
+
+
+@pytest.mark.parametrize("kwargs, volume, bbox", BASELINE)
+def test_same_as_baseline(kwargs, volume, bbox):
+    part = gf.extra.SubdividedCompartment([[True] * 2] * 2, 14, **kwargs)
+    box = part.bounding_box()
+    # the pockets are built one by one, so the volume differs from the
+    # baseline by the fillet approximations only
+    assert part.volume == pytest.approx(volume, abs=0.01)
+    assert (*box.min, *box.max) == pytest.approx(bbox, abs=1e-3)
+
+
+def test_short_rounds_next_to_cutouts():
+    # the divider rounds between the pocket corners and the cutouts are
+    # shorter than the pocket fillet, the baseline bin is 59189.383
+    grid = [[True] * 2] * 2
+    compartment = gf.extra.SubdividedCompartment(
+        grid,
+        14,
+        div_x=4,
+        div_y=4,
+        div_cutout_width=20,
+        div_cutout_height=5,
+    )
+    part = gf.Bin(grid, 21, compartment=compartment)
+    assert part.is_valid
+    assert len(part.solids()) == 1
+    assert part.volume == pytest.approx(59189.383, rel=1e-3)
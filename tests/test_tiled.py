@@ -0,0 +1,36 @@
+import pytest
+
+import gridfinity as gf
+
+T, F = True, False
+
+GRIDS = {
+    "rectangular": [[T] * 3] * 2,
+    "L": [[T, T, T], [T, F, F], [T, F, F]],
+    "diagonal": [[T, F], [F, T]],
+    "holed": [[T, T, T], [T, F, T], [T, T, T]],
+}
+
+
+@pytest.mark.parametrize("detail", ["print", "preview"])
+@pytest.mark.parametrize("name", GRIDS)
+def test_same_as_bin(name, detail):
+    grid = GRIDS[name]
+    part = gf.Bin(grid, 21, detail=detail)
+    tiled = gf.TiledBin(grid, 21, detail=detail)
+    assert tiled.is_valid
+    assert len(tiled.solids()) == len(part.solids())
+    assert tiled.volume == pytest.approx(part.volume, rel=1e-9)
+    box, other = part.bounding_box(), tiled.bounding_box()
+    assert (*other.min, *other.max) == pytest.approx(
+        (*box.min, *box.max), abs=1e-6
+    )
+
+
+def test_cells_touching_at_a_corner():
+    # each island is a bin of its own
+    one = gf.Bin([[T]], 21).volume
+    for cls in (gf.Bin, gf.TiledBin):
+        part = cls(GRIDS["diagonal"], 21)
+        volumes = [s.volume for s in part.solids()]
+        assert volumes == pytest.approx([one, one], rel=1e-9)
@@ -0,0 +1,90 @@
+import pytest
+
+import gridfinity as gf
+from gridfinity.topology import analyze, split, validate
+
+T, F = True, False
+
+RING = [[T, T, T], [T, F, T], [T, T, T]]
+TWO_HOLES = [[T, T, T, T, T], [T, F, T, F, T], [T, T, T, T, T]]
+DIAGONAL = [[T, F], [F, T]]
+# four arms around an empty center, each touching the next at a corner
+PINWHEEL = [[F, T, T, F], [T, F, F, T], [T, F, F, T], [F, T, T, F]]
+
+
+def test_islands():
+    t = analyze([[T, F, T], [F, F, F], [T, T, F]])
+    assert [(i.row, i.col, i.grid) for i in t.islands] == [
+        (0, 0, gf.Grid([[T]])),
+        (0, 2, gf.Grid([[T]])),
+        (2, 0, gf.Grid([[T, T]])),
+    ]
+    assert (t.cells, t.holes, t.euler) == (4, 0, 3)
+    assert (t.empty_rows, t.empty_cols) == ((1,), ())
+    assert split([[T, F, T]]) == list(analyze([[T, F, T]]).islands)
+
+
+@pytest.mark.parametrize("grid, holes", [(RING, 1), (TWO_HOLES, 2)])
+def test_holes(grid, holes):
+    t = analyze(grid)
+    assert len(t.islands) == 1
+    assert t.holes == holes
+    assert t.corner_contacts == ()
+    # one face with a hole per inner outline
+    (face,) = gf.GridSketch(grid).faces()
+    assert len(face.inner_wires()) == holes
+
+
+@pytest.mark.parametrize(
+    "grid, contacts",
+    [
+        (DIAGONAL, ((0, 0),)),
+        ([[F, T], [T, F]], ((0, 0),)),
+        (PINWHEEL, ((0, 0), (0, 2), (2, 0), (2, 2))),
+    ],
+)
+def test_corner_contacts(grid, contacts):
+    t = analyze(grid)
+    assert t.corner_contacts == contacts
+    # cells touching at a corner are separate islands enclosing no hole
+    assert len(t.islands) == len(gf.GridSketch(grid).faces())
+    assert t.holes == 0
+
+
+def test_validate():
+    assert validate(RING).holes == 1
+    with pytest.raises(ValueError, match="^Invalid grid: 2 holes$"):
+        validate(TWO_HOLES, allow_holes=False)
+    with pytest.raises(ValueError, match="^Invalid grid: 4 islands$"):
+        validate(PINWHEEL, allow_islands=False)
+    with pytest.raises(ValueError, match="corner at 0,0, 0,2, 2,0, 2,2$"):
+        validate(PINWHEEL, allow_corner_contacts=False)
+    # all problems at once
+    with pytest.raises(
+        ValueError,
+        match=r"2 islands; 1 holes; empty rows \[3\] and columns \[\]$",
+    ):
+        validate(
+            [*RING, [F, F, F], [T, F, F]],
+            allow_islands=False,
+            allow_holes=False,
+            allow_empty_lines=False,
+        )
+
+
+@pytest.mark.parametrize(
+    "build",
+    [
+        lambda grid: gf.GridSketch(grid),
+        lambda grid: gf.StackingLip(grid),
+        lambda grid: gf.Compartment(grid, 7),
+        lambda grid: gf.Base(grid),
+        lambda grid: gf.Bin(grid, 21),
+        lambda grid: gf.extra.SubdividedCompartment(grid, 7, 2, 2),
+        validate,
+    ],
+)
+@pytest.mark.parametrize("grid", [[], [[F]], [[F, F], []]])
+def test_no_cells(build, grid):
+    with pytest.raises(ValueError, match="Grid does not contain any cells"):
+        build(grid)